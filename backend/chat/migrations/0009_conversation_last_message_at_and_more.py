@@ -0,0 +1,33 @@
+# Generated by Django 4.2.21 on 2026-10-16 17:48
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_last_message_at(apps, schema_editor):
+    Conversation = apps.get_model('chat', 'Conversation')
+    Message = apps.get_model('chat', 'Message')
+    latest_timestamp = Message.objects.filter(
+        conversation=OuterRef('pk')
+    ).order_by('-timestamp').values('timestamp')[:1]
+    Conversation.objects.update(last_message_at=Subquery(latest_timestamp))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0008_message_shared_track'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, help_text='Timestamp of the latest message, kept in sync by Message.save() for index-backed sorting.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['-last_message_at', '-updated_at'], name='chat_conver_last_me_802da9_idx'),
+        ),
+        migrations.RunPython(backfill_last_message_at, reverse_code=migrations.RunPython.noop),
+    ]
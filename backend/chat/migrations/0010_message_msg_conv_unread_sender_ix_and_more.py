@@ -0,0 +1,21 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0009_conversation_last_message_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'is_read', 'sender_user'], name='msg_conv_unread_sender_ix'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['conversation', 'sender_user'], name='msg_conv_unread_partial_ix'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:07
+
+from django.db import migrations, models
+
+
+def backfill_participants_key(apps, schema_editor):
+    Conversation = apps.get_model('chat', 'Conversation')
+    seen_keys = set()
+    # Most recently updated first, matching the conversation send_initial_message used to pick
+    # when duplicates existed; older duplicates keep a NULL key.
+    conversations = Conversation.objects.filter(
+        initiator_user__isnull=False
+    ).prefetch_related('participants').order_by('-updated_at')
+    for conversation in conversations.iterator(chunk_size=500):
+        participant_ids = {user.pk for user in conversation.participants.all()}
+        if len(participant_ids) != 2 or conversation.initiator_user_id not in participant_ids:
+            continue
+        (recipient_user_id,) = participant_ids - {conversation.initiator_user_id}
+        initiator_artist_id = conversation.initiator_artist_profile_id if conversation.initiator_identity_type == 'ARTIST' else None
+        endpoints = sorted([
+            f"{conversation.initiator_user_id}:{initiator_artist_id or ''}",
+            f"{recipient_user_id}:{conversation.related_artist_recipient_id or ''}",
+        ])
+        key = "|".join(endpoints)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        Conversation.objects.filter(pk=conversation.pk).update(participants_key=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0010_message_msg_conv_unread_sender_ix_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='participants_key',
+            field=models.CharField(blank=True, editable=False, help_text='Direction-independent identity of the two conversation endpoints; unique per conversation.', max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_participants_key, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(fields=('participants_key',), name='chat_conversation_unique_participants_key'),
+        ),
+    ]
@@ -64,6 +64,15 @@ class Conversation(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True, help_text="Timestamp of the last message or activity.")
+    last_message_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Timestamp of the latest message, kept in sync by Message.save() for index-backed sorting."
+    )
+    participants_key = models.CharField(
+        max_length=64,
+        null=True, blank=True, editable=False,
+        help_text="Direction-independent identity of the two conversation endpoints; unique per conversation."
+    )
 
     def __str__(self):
         participant_names = ", ".join([user.username for user in self.participants.all()])
@@ -86,8 +95,22 @@ class Conversation(models.Model):
         ordering = ['-updated_at']
         indexes = [
             models.Index(fields=['initiator_identity_type', 'initiator_artist_profile']),
+            models.Index(fields=['-last_message_at', '-updated_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['participants_key'], name='chat_conversation_unique_participants_key'),
         ]
 
+    @staticmethod
+    def build_participants_key(first_user_id, first_artist_id, second_user_id, second_artist_id):
+        # Each endpoint is a user acting either as themselves or as one of their artist profiles.
+        # Endpoints are sorted so A->B and B->A map to the same key.
+        endpoints = sorted([
+            f"{first_user_id}:{first_artist_id or ''}",
+            f"{second_user_id}:{second_artist_id or ''}",
+        ])
+        return "|".join(endpoints)
+
     def clean(self):
         super().clean()
         if self.initiator_identity_type == self.IdentityType.ARTIST:
@@ -101,13 +124,36 @@ class Conversation(models.Model):
     def save(self, *args, **kwargs):
         if self.initiator_identity_type == self.IdentityType.USER:
             self.initiator_artist_profile = None
-        self.full_clean()
+        # participants_key uniqueness is enforced by the database; send_initial_message's
+        # get_or_create relies on the IntegrityError rather than a pre-save lookup.
+        self.full_clean(validate_constraints=False)
         super().save(*args, **kwargs)
 
 
-    def update_timestamp(self):
-        self.updated_at = timezone.now()
-        self.save(update_fields=['updated_at'])
+    def update_timestamp(self, last_message_at=None, **extra_fields):
+        # Written with a queryset UPDATE: these fields need neither save() nor full_clean().
+        changes = {'updated_at': timezone.now(), **extra_fields}
+        if last_message_at is not None:
+            changes['last_message_at'] = last_message_at
+        Conversation.objects.filter(pk=self.pk).update(**changes)
+        for field_name, value in changes.items():
+            setattr(self, field_name, value)
+
+    @property
+    def latest_message(self):
+        # ConversationViewSet prefetches only the newest message into `prefetched_latest_messages`.
+        prefetched = getattr(self, 'prefetched_latest_messages', None)
+        if prefetched is not None:
+            return prefetched[0] if prefetched else None
+        return self.messages.last()
+
+    @property
+    def participant_list(self):
+        # ConversationViewSet prefetches participants into `prefetched_participants`.
+        prefetched = getattr(self, 'prefetched_participants', None)
+        if prefetched is not None:
+            return prefetched
+        return list(self.participants.all())
 
     def get_other_participant(self, user_instance): # Parameter renamed for clarity
         if self.participants.count() == 2:
@@ -178,6 +224,13 @@ class Message(models.Model):
         ordering = ['timestamp']
         indexes = [ 
             models.Index(fields=['sender_identity_type', 'sending_artist']),
+            # Unread-message lookups (mark-as-read, unread counts) filter on these three columns.
+            models.Index(fields=['conversation', 'is_read', 'sender_user'], name='msg_conv_unread_sender_ix'),
+            models.Index(
+                fields=['conversation', 'sender_user'],
+                condition=models.Q(is_read=False),
+                name='msg_conv_unread_partial_ix'
+            ),
         ]
 
     def clean(self): 
@@ -243,10 +296,9 @@ class Message(models.Model):
                self.conversation.initiator_user and \
                self.sender_user != self.conversation.initiator_user: 
                 if not self.conversation.messages.filter(sender_user=self.sender_user).exclude(pk=self.pk).exists():
-                    self.conversation.is_accepted = True
-                    self.conversation.save(update_fields=['is_accepted', 'updated_at'])
-                else: self.conversation.update_timestamp()
-            else: self.conversation.update_timestamp()
+                    self.conversation.update_timestamp(last_message_at=self.timestamp, is_accepted=True)
+                else: self.conversation.update_timestamp(last_message_at=self.timestamp)
+            else: self.conversation.update_timestamp(last_message_at=self.timestamp)
 
 @receiver(pre_save, sender=Message)
 def message_pre_save_delete_old_attachment(sender, instance, **kwargs):
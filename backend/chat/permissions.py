@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from .models import Conversation
+
 class IsConversationParticipant(permissions.BasePermission):
     """
     Custom permission to only allow participants of a conversation to access it.
@@ -10,7 +12,7 @@ class IsConversationParticipant(permissions.BasePermission):
         # if request.method in permissions.SAFE_METHODS:
         #     return True
         # Instance must have an attribute named `participants`.
-        return request.user in obj.participants.all()
+        return obj.participants.filter(pk=request.user.pk).exists()
 
 class IsMessageSenderOrParticipantReadOnly(permissions.BasePermission):
     """
@@ -22,7 +24,7 @@ class IsMessageSenderOrParticipantReadOnly(permissions.BasePermission):
         # obj here is a Message instance
         # Allow read access if user is a participant of the message's conversation
         if request.method in permissions.SAFE_METHODS:
-            return request.user in obj.conversation.participants.all()
+            return Conversation.objects.filter(pk=obj.conversation_id, participants=request.user).exists()
         
         # Write permissions only allowed to the sender of the message
         return obj.sender == request.user
\ No newline at end of file
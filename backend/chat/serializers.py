@@ -1,9 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxLengthValidator 
+from django.urls import reverse
 from .models import Conversation, Message
 from users.serializers import UserSerializer as FullUserSerializer # Renamed for clarity
-from music.models import Artist, Track # Import Track
+from music.models import Artist, Release, Track # Import Track
+from django.db.models import Q, ExpressionWrapper, BooleanField
 from music.serializers import TrackSerializer as MusicTrackSerializer # For shared track details
 import logging 
 
@@ -11,6 +13,31 @@ User = get_user_model()
 MAX_MESSAGE_LENGTH = 1000 
 logger = logging.getLogger(__name__) 
 
+def tracks_with_share_permission(user):
+    # Publicly visible tracks can be shared by anyone; artists may also share their own drafts.
+    return Track.objects.select_related('release__artist').annotate(
+        can_share=ExpressionWrapper(
+            Release.visible_q('release__') | Q(release__artist__user=user),
+            output_field=BooleanField()
+        )
+    )
+
+class ShareableTrackField(serializers.PrimaryKeyRelatedField):
+    """Resolves a track id and checks the requesting user may share it, in a single query."""
+    default_error_messages = {
+        'does_not_exist': 'Track to share not found.',
+        'cannot_share': "This track cannot be shared at this time (e.g., it's a draft by another artist).",
+    }
+
+    def get_queryset(self):
+        return tracks_with_share_permission(self.context['request'].user)
+
+    def to_internal_value(self, data):
+        track = super().to_internal_value(data)
+        if not track.can_share:
+            self.fail('cannot_share')
+        return track
+
 class BasicUserSerializer(serializers.ModelSerializer): # For embedding in chat related objects
     class Meta:
         model = User
@@ -31,6 +58,7 @@ class MessageSerializer(serializers.ModelSerializer):
     sending_artist_details = ArtistChatInfoSerializer(source='sending_artist', read_only=True, allow_null=True)
     
     shared_track_details = MusicTrackSerializer(source='shared_track', read_only=True, allow_null=True)
+    shared_track = ShareableTrackField(write_only=True, required=False, allow_null=True)
 
     class Meta:
         model = Message
@@ -58,7 +86,6 @@ class MessageSerializer(serializers.ModelSerializer):
         ] 
         extra_kwargs = {
             'attachment': {'write_only': True, 'required': False, 'allow_null': True}, 
-            'shared_track': {'write_only': True, 'required': False, 'allow_null': True, 'queryset': Track.objects.all()},
             'text': {
                 'required': False, 
                 'allow_blank': True, 
@@ -71,7 +98,6 @@ class MessageSerializer(serializers.ModelSerializer):
         if obj.attachment and obj.attachment.name:
             request = self.context.get('request')
             if request:
-                from django.urls import reverse
                 try:
                     download_url = reverse('chat-attachment-download', kwargs={'message_pk': obj.pk})
                     return request.build_absolute_uri(download_url)
@@ -129,9 +155,70 @@ class MessageSerializer(serializers.ModelSerializer):
                     raise serializers.ValidationError({"attachment": "Uploaded file does not appear to be an audio file for this message type."})
         return data
 
+MESSAGE_LIST_VALUES = (
+    'id', 'conversation_id', 'sender_user_id', 'sender_user__username',
+    'sender_identity_type', 'sending_artist_id', 'sending_artist__name',
+    'sending_artist__artist_picture', 'text', 'attachment',
+    'original_attachment_filename', 'message_type', 'shared_track_id',
+    'timestamp', 'is_read',
+)
+
+def serialize_message_rows(rows, request=None):
+    """
+    Read-only fast path for message lists. Builds the same payload shape as
+    MessageSerializer from `.values(*MESSAGE_LIST_VALUES)` rows, without
+    instantiating model instances or per-row serializers.
+    """
+    rows = list(rows)
+    timestamp_field = serializers.DateTimeField()
+    attachment_storage = Message._meta.get_field('attachment').storage
+    artist_picture_storage = Artist._meta.get_field('artist_picture').storage
+
+    def absolute(url):
+        return request.build_absolute_uri(url) if request else url
+
+    shared_track_ids = {row['shared_track_id'] for row in rows if row['shared_track_id']}
+    shared_tracks = {}
+    if shared_track_ids:
+        tracks = Track.objects.filter(pk__in=shared_track_ids).select_related('release').prefetch_related('genres')
+        for track_data in MusicTrackSerializer(tracks, many=True, context={'request': request}).data:
+            shared_tracks[track_data['id']] = track_data
+
+    data = []
+    for row in rows:
+        sending_artist_details = None
+        if row['sending_artist_id']:
+            picture = row['sending_artist__artist_picture']
+            sending_artist_details = {
+                'id': row['sending_artist_id'],
+                'name': row['sending_artist__name'],
+                'artist_picture': absolute(artist_picture_storage.url(picture)) if picture else None,
+            }
+        attachment_url = None
+        if row['attachment']:
+            if request:
+                attachment_url = request.build_absolute_uri(reverse('chat-attachment-download', kwargs={'message_pk': row['id']}))
+            else:
+                attachment_url = attachment_storage.url(row['attachment'])
+        data.append({
+            'id': row['id'],
+            'conversation': row['conversation_id'],
+            'sender_user': {'id': row['sender_user_id'], 'username': row['sender_user__username']},
+            'sender_identity_type': row['sender_identity_type'],
+            'sending_artist_details': sending_artist_details,
+            'text': row['text'],
+            'attachment_url': attachment_url,
+            'original_attachment_filename': row['original_attachment_filename'],
+            'message_type': row['message_type'],
+            'shared_track_details': shared_tracks.get(row['shared_track_id']),
+            'timestamp': timestamp_field.to_representation(row['timestamp']),
+            'is_read': row['is_read'],
+        })
+    return data
+
 class ConversationSerializer(serializers.ModelSerializer):
-    participants = BasicUserSerializer(many=True, read_only=True)
-    latest_message = MessageSerializer(read_only=True, source='messages.last') 
+    participants = BasicUserSerializer(source='participant_list', many=True, read_only=True)
+    latest_message = MessageSerializer(read_only=True) 
     
     initiator_user = BasicUserSerializer(read_only=True)
     initiator_identity_type = serializers.ChoiceField(choices=Conversation.IdentityType.choices, read_only=True)
@@ -169,9 +256,7 @@ class ConversationSerializer(serializers.ModelSerializer):
         if not requesting_user.is_authenticated: return None
 
         if obj.related_artist_recipient:
-            if hasattr(requesting_user, 'artist_profile') and \
-               requesting_user.artist_profile and \
-               requesting_user.artist_profile == obj.related_artist_recipient:
+            if obj.related_artist_recipient.user_id == requesting_user.id:
                 if obj.initiator_identity_type == Conversation.IdentityType.ARTIST and obj.initiator_artist_profile:
                     return f"{obj.initiator_artist_profile.name} [Artist]"
                 elif obj.initiator_user: 
@@ -181,7 +266,8 @@ class ConversationSerializer(serializers.ModelSerializer):
             else:
                 return f"{obj.related_artist_recipient.name} [Artist]"
         else:
-            other_user_model = obj.participants.exclude(id=requesting_user.id).first()
+            # participant_list reuses the list view's participants prefetch.
+            other_user_model = next((user for user in obj.participant_list if user.id != requesting_user.id), None)
             if not other_user_model: return "Conversation" 
             if obj.initiator_user == other_user_model and \
                obj.initiator_identity_type == Conversation.IdentityType.ARTIST and \
@@ -204,7 +290,7 @@ class CreateMessageSerializer(serializers.Serializer):
     )
     attachment = serializers.FileField(required=False, allow_null=True)
     message_type = serializers.ChoiceField(choices=Message.MessageType.choices, default=Message.MessageType.TEXT)
-    shared_track_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
+    shared_track_id = ShareableTrackField(source='shared_track', write_only=True, required=False, allow_null=True)
     
     initiator_identity_type = serializers.ChoiceField(
         choices=Conversation.IdentityType.choices, 
@@ -213,41 +299,13 @@ class CreateMessageSerializer(serializers.Serializer):
     )
     initiator_artist_profile_id = serializers.IntegerField(required=False, allow_null=True)
 
-    def validate_shared_track_id(self, value):
-        if value is not None:
-            # Artist should be able to select their own draft tracks to share.
-            # This requires context of the requesting user to check ownership.
-            # For now, basic existence check. Advanced logic in view.
-            if not Track.objects.filter(id=value).exists():
-                 raise serializers.ValidationError("Shared track does not exist.")
-        return value
-
     def validate_recipient_user_id(self, value):
         if value is not None: 
-            if not User.objects.filter(id=value).exists():
-                raise serializers.ValidationError("Recipient user does not exist.")
             request = self.context.get('request')
             if request and request.user.id == value:
                 raise serializers.ValidationError("You cannot send a message to yourself as a user.")
         return value
 
-    def validate_recipient_artist_id(self, value):
-        if value is not None: 
-            try:
-                artist = Artist.objects.select_related('user').get(id=value)
-                request = self.context.get('request')
-                if request and request.user == artist.user:
-                    initiator_type_from_initial = self.initial_data.get('initiator_identity_type', Conversation.IdentityType.USER)
-                    if initiator_type_from_initial == Conversation.IdentityType.USER:
-                        raise serializers.ValidationError("You cannot send a message from your user account to your own artist profile.")
-                initiator_artist_id_from_initial = self.initial_data.get('initiator_artist_profile_id')
-                if initiator_artist_id_from_initial and int(initiator_artist_id_from_initial) == artist.id:
-                    raise serializers.ValidationError("An artist profile cannot send a message to itself.")
-
-            except Artist.DoesNotExist:
-                 raise serializers.ValidationError("Recipient artist does not exist.")
-        return value
-
     def validate(self, data):
         recipient_user_id = data.get('recipient_user_id')
         recipient_artist_id = data.get('recipient_artist_id')
@@ -278,10 +336,30 @@ class CreateMessageSerializer(serializers.Serializer):
                 raise serializers.ValidationError({"initiator_artist_profile_id": "initiator_artist_profile_id should not be provided if initiating as USER."})
             data['initiator_artist_profile_instance'] = None 
 
+        # Resolve the recipient with a single query, only once the payload is otherwise valid.
+        if recipient_user_id:
+            recipient_user = User.objects.only('id', 'username').filter(pk=recipient_user_id).first()
+            if recipient_user is None:
+                raise serializers.ValidationError({"recipient_user_id": "Recipient user does not exist."})
+            data['recipient_user_instance'] = recipient_user
+            data['recipient_artist_instance'] = None
+        else:
+            recipient_artist = Artist.objects.select_related('user').only(
+                'id', 'name', 'artist_picture', 'user__id', 'user__username'
+            ).filter(pk=recipient_artist_id).first()
+            if recipient_artist is None:
+                raise serializers.ValidationError({"recipient_artist_id": "Recipient artist does not exist."})
+            if recipient_artist.user_id == request_user.id and initiator_identity_type == Conversation.IdentityType.USER:
+                raise serializers.ValidationError({"recipient_artist_id": "You cannot send a message from your user account to your own artist profile."})
+            if initiator_artist_profile_id and int(initiator_artist_profile_id) == recipient_artist.id:
+                raise serializers.ValidationError({"recipient_artist_id": "An artist profile cannot send a message to itself."})
+            data['recipient_user_instance'] = recipient_artist.user
+            data['recipient_artist_instance'] = recipient_artist
+
         message_type = data.get('message_type', Message.MessageType.TEXT)
         text = data.get('text')
         attachment = data.get('attachment')
-        shared_track_id = data.get('shared_track_id')
+        shared_track_id = data.get('shared_track')
 
         if text and len(text) > MAX_MESSAGE_LENGTH: 
             raise serializers.ValidationError({"text": f"Text cannot exceed {MAX_MESSAGE_LENGTH} characters."})
@@ -1,3 +1,169 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
\ No newline at end of file
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from music.models import Artist
+from .models import Conversation, Message
+from .views import _parse_byte_range
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp(prefix='chat_tests_')
+
+def tearDownModule():
+    shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+
+class ParseByteRangeTests(SimpleTestCase):
+    FILE_SIZE = 100
+
+    def parse(self, range_header):
+        return _parse_byte_range(range_header, self.FILE_SIZE)
+
+    def test_missing_header_serves_whole_file(self):
+        self.assertIsNone(self.parse(None))
+        self.assertIsNone(self.parse(''))
+
+    def test_closed_range(self):
+        self.assertEqual(self.parse('bytes=10-19'), (10, 19))
+
+    def test_end_past_eof_is_clamped(self):
+        self.assertEqual(self.parse('bytes=90-150'), (90, 99))
+
+    def test_open_ended_range(self):
+        self.assertEqual(self.parse('bytes=40-'), (40, 99))
+
+    def test_suffix_range(self):
+        self.assertEqual(self.parse('bytes=-10'), (90, 99))
+
+    def test_suffix_longer_than_file_is_whole_file(self):
+        self.assertEqual(self.parse('bytes=-500'), (0, 99))
+
+    def test_zero_length_suffix_is_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            self.parse('bytes=-0')
+
+    def test_start_past_eof_is_unsatisfiable(self):
+        for range_header in ('bytes=100-', 'bytes=150-200'):
+            with self.subTest(range_header=range_header), self.assertRaises(ValueError):
+                self.parse(range_header)
+
+    def test_multiple_ranges_serve_whole_file(self):
+        self.assertIsNone(self.parse('bytes=0-9,20-29'))
+
+    def test_invalid_headers_are_ignored(self):
+        for range_header in ('bytes=-', 'bytes=a-b', 'items=0-9', 'bytes=20-10'):
+            with self.subTest(range_header=range_header):
+                self.assertIsNone(self.parse(range_header))
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class ServeChatAttachmentTests(TestCase):
+    CONTENT = bytes(range(256)) * 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sender = User.objects.create_user(username='attachment_sender', password='testpassword')
+        cls.recipient = User.objects.create_user(username='attachment_recipient', password='testpassword')
+        cls.outsider = User.objects.create_user(username='attachment_outsider', password='testpassword')
+        conversation = Conversation.objects.create(
+            initiator_user=cls.sender,
+            participants_key=Conversation.build_participants_key(cls.sender.pk, None, cls.recipient.pk, None)
+        )
+        conversation.participants.add(cls.sender, cls.recipient)
+        cls.message = Message.objects.create(
+            conversation=conversation,
+            sender_user=cls.sender,
+            sender_identity_type=Message.SenderIdentity.USER,
+            message_type=Message.MessageType.AUDIO,
+            attachment=SimpleUploadedFile('clip.mp3', cls.CONTENT, content_type='audio/mpeg'),
+        )
+        cls.url = reverse('chat-attachment-download', kwargs={'message_pk': cls.message.pk})
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.recipient)
+
+    def test_full_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'audio/mpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+
+    def test_partial_content(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.CONTENT)}')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[100:200])
+
+    def test_suffix_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-24')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 1000-1023/{len(self.CONTENT)}')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[-24:])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.CONTENT)}')
+
+    def test_multiple_ranges_serve_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9,20-29')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+
+    def test_non_participant_is_forbidden(self):
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-9').status_code, 403)
+
+
+class ConversationParticipantsKeyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user(username='key_alice', password='testpassword')
+        cls.bob = User.objects.create_user(username='key_bob', password='testpassword')
+        cls.bob_artist = Artist.objects.create(user=cls.bob, name='Bob Band')
+        cls.url = reverse('conversation-send-initial-message')
+
+    def send(self, sender, **data):
+        client = APIClient()
+        client.force_authenticate(sender)
+        return client.post(self.url, {'text': 'hello', **data}, format='json')
+
+    def test_key_is_direction_independent(self):
+        self.assertEqual(
+            Conversation.build_participants_key(1, None, 2, 5),
+            Conversation.build_participants_key(2, 5, 1, None)
+        )
+        self.assertNotEqual(
+            Conversation.build_participants_key(1, None, 2, None),
+            Conversation.build_participants_key(1, None, 2, 5)
+        )
+
+    def test_both_directions_share_one_conversation(self):
+        first = self.send(self.alice, recipient_user_id=self.bob.pk)
+        self.assertEqual(first.status_code, 201, first.content)
+        second = self.send(self.bob, recipient_user_id=self.alice.pk)
+        self.assertEqual(second.status_code, 201, second.content)
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.assertEqual(Conversation.objects.count(), 1)
+        self.assertEqual(Message.objects.filter(conversation_id=first.data['id']).count(), 2)
+        self.assertEqual({user['id'] for user in second.data['participants']}, {self.alice.pk, self.bob.pk})
+
+    def test_artist_target_is_a_separate_conversation(self):
+        to_user = self.send(self.alice, recipient_user_id=self.bob.pk)
+        to_artist = self.send(self.alice, recipient_artist_id=self.bob_artist.pk)
+        self.assertEqual(to_artist.status_code, 201, to_artist.content)
+        self.assertNotEqual(to_user.data['id'], to_artist.data['id'])
+
+    def test_database_rejects_duplicate_key(self):
+        participants_key = Conversation.build_participants_key(self.alice.pk, None, self.bob.pk, None)
+        Conversation.objects.create(initiator_user=self.alice, participants_key=participants_key)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Conversation.objects.create(initiator_user=self.bob, participants_key=participants_key)
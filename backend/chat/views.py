@@ -1,31 +1,120 @@
-from django.db.models import Q, Count, Max, Exists, OuterRef
+from django.db.models import Q, Count, Max, Exists, OuterRef, Prefetch
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action, api_view, permission_classes as drf_permission_classes
-from django.http import FileResponse, Http404, HttpResponseForbidden
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils.http import content_disposition_header
 import os
+import re
 import mimetypes 
 import logging 
+from functools import lru_cache
 
 from .models import Conversation, Message 
 from music.models import Artist, Track # Import Track
 from .serializers import (
-    ConversationSerializer, MessageSerializer, CreateMessageSerializer
+    ConversationSerializer, MessageSerializer, CreateMessageSerializer,
+    MESSAGE_LIST_VALUES, serialize_message_rows
 )
 from .permissions import IsConversationParticipant, IsMessageSenderOrParticipantReadOnly 
 
 User = get_user_model()
 logger = logging.getLogger(__name__) 
 
+# Attachments are streamed in 64 KiB chunks rather than FileResponse's 4 KiB default.
+ATTACHMENT_STREAM_BLOCK_SIZE = 64 * 1024
+BYTE_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+def _parse_byte_range(range_header, file_size):
+    """
+    Parses a single-range `Range: bytes=...` header into an inclusive (start, end) pair.
+    Returns None when the header is absent, invalid or not a single byte range (serve the whole file),
+    and raises ValueError when the range cannot be satisfied.
+    """
+    match = BYTE_RANGE_RE.match(range_header.strip()) if range_header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    start_str, end_str = match.groups()
+    if start_str:
+        start = int(start_str)
+        if end_str and int(end_str) < start:
+            return None # A last-byte-pos before the first makes the header invalid, and invalid ranges are ignored
+        end = min(int(end_str), file_size - 1) if end_str else file_size - 1
+    else: # Suffix range: the last N bytes
+        start = max(file_size - int(end_str), 0)
+        end = file_size - 1
+    if start > end or start >= file_size:
+        raise ValueError("Unsatisfiable byte range.")
+    return start, end
+
+# First tier of the content-type lookup: the formats chat attachments actually use.
+# Anything else falls through to the (much larger) mimetypes table.
+COMMON_ATTACHMENT_CONTENT_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.aac': 'audio/aac',
+    '.wav': 'audio/wav',
+    '.flac': 'audio/flac',
+    '.ogg': 'audio/ogg',
+    '.oga': 'audio/ogg',
+    '.opus': 'audio/opus',
+    '.webm': 'audio/webm',
+    '.aiff': 'audio/aiff',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif',
+    '.pdf': 'application/pdf',
+    '.txt': 'text/plain',
+    '.zip': 'application/zip',
+}
+
+@lru_cache(maxsize=512)
+def _guess_content_type_for_extension(extension):
+    content_type = COMMON_ATTACHMENT_CONTENT_TYPES.get(extension)
+    if content_type is None:
+        content_type, _ = mimetypes.guess_type(f'file{extension}')
+    return content_type or 'application/octet-stream'
+
+def guess_attachment_content_type(filename):
+    # Keyed on the lower-cased extension so per-user filenames share cache entries.
+    return _guess_content_type_for_extension(os.path.splitext(filename)[1].lower())
+
+def _iter_file_range(file_obj, start, end, block_size=ATTACHMENT_STREAM_BLOCK_SIZE):
+    try:
+        file_obj.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file_obj.read(min(block_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file_obj.close()
+
 @api_view(['GET'])
 @drf_permission_classes([permissions.IsAuthenticated]) 
 def serve_chat_attachment(request, message_pk):
-    message = get_object_or_404(Message, pk=message_pk)
-    conversation = message.conversation
+    # Fetch the message and the caller's membership of its conversation in one query.
+    # Only the attachment columns are loaded; the text body is never needed here.
+    is_participant = Conversation.participants.through.objects.filter(
+        conversation_id=OuterRef('conversation_id'), user_id=request.user.pk
+    )
+    message = get_object_or_404(
+        Message.objects.only('id', 'attachment', 'original_attachment_filename', 'conversation_id')
+        .annotate(is_participant=Exists(is_participant)),
+        pk=message_pk
+    )
 
-    if not request.user in conversation.participants.all():
+    if not message.is_participant:
         return Response({"detail": "You do not have permission to access this file."}, status=status.HTTP_403_FORBIDDEN)
 
     if not message.attachment or not message.attachment.name:
@@ -34,17 +123,36 @@ def serve_chat_attachment(request, message_pk):
     try:
         filename_for_download = message.original_attachment_filename or os.path.basename(message.attachment.name)
         
-        content_type, encoding = mimetypes.guess_type(filename_for_download)
-        if content_type is None:
-            content_type = 'application/octet-stream'
+        content_type = guess_attachment_content_type(filename_for_download)
 
-        response = FileResponse(message.attachment.open('rb'), content_type=content_type)
-        
-        if request.query_params.get('download') == 'true':
-            response['Content-Disposition'] = f'attachment; filename="{filename_for_download}"'
+        as_attachment = request.query_params.get('download') == 'true'
+        file_size = message.attachment.size
+
+        try:
+            byte_range = _parse_byte_range(request.META.get('HTTP_RANGE'), file_size)
+        except ValueError:
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response['Content-Range'] = f'bytes */{file_size}'
+            return response
+
+        if byte_range is None:
+            # FileResponse sets Content-Length/Disposition and lets the server use wsgi.file_wrapper.
+            response = FileResponse(
+                message.attachment.open('rb'), content_type=content_type,
+                as_attachment=as_attachment, filename=filename_for_download
+            )
+            response.block_size = ATTACHMENT_STREAM_BLOCK_SIZE
         else:
-            response['Content-Disposition'] = f'inline; filename="{filename_for_download}"'
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _iter_file_range(message.attachment.open('rb'), start, end),
+                status=status.HTTP_206_PARTIAL_CONTENT, content_type=content_type
+            )
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{file_size}'
+            response['Content-Disposition'] = content_disposition_header(as_attachment, filename_for_download)
 
+        response['Accept-Ranges'] = 'bytes'
         return response
     except FileNotFoundError:
         return Response({"detail": "File not found in storage."}, status=status.HTTP_404_NOT_FOUND)
@@ -59,23 +167,36 @@ class ConversationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        return Conversation.objects.filter(
-            participants=user
-        ).select_related(
+        queryset = Conversation.objects.filter(participants=user)
+        if self.action == 'list_messages':
+            # list_messages reads the messages itself; it only needs the conversation row.
+            return queryset
+
+        # Only the newest message per conversation is rendered (as `latest_message`).
+        # The joined sender rows are narrowed to the columns MessageSerializer renders.
+        latest_message_queryset = Message.objects.select_related(
+            'sender_user',
+            'sending_artist',
+            'shared_track__release' # For shared track details
+        ).only(
+            'id', 'conversation_id', 'sender_identity_type', 'text', 'attachment',
+            'original_attachment_filename', 'message_type', 'timestamp', 'is_read',
+            'sender_user__id', 'sender_user__username',
+            'sending_artist__id', 'sending_artist__name', 'sending_artist__artist_picture',
+            'shared_track'
+        ).prefetch_related('shared_track__genres').order_by('-timestamp')[:1]
+
+        return queryset.select_related(
             'initiator_user__profile', 
             'initiator_user__artist_profile', 
             'initiator_artist_profile',    
             'related_artist_recipient'     
         ).prefetch_related(
-            'participants__profile',                 
-            'participants__artist_profile',          
-            'messages__sender_user__profile',        
-            'messages__sender_user__artist_profile', 
-            'messages__sending_artist',
-            'messages__shared_track__release__artist' # For shared track details
-        ).annotate(
-            last_message_time=Max('messages__timestamp')
-        ).order_by('-last_message_time', '-updated_at')
+            Prefetch('participants', to_attr='prefetched_participants'),
+            'prefetched_participants__profile',
+            'prefetched_participants__artist_profile',
+            Prefetch('messages', queryset=latest_message_queryset, to_attr='prefetched_latest_messages')
+        ).order_by('-last_message_at', '-updated_at')
 
     def get_permissions(self):
         if self.action in ['list_messages', 'send_reply', 'accept_request', 'retrieve', 'partial_update', 'update', 'destroy']:
@@ -94,22 +215,9 @@ class ConversationViewSet(viewsets.ModelViewSet):
         current_sender_identity_type = validated_data.get('initiator_identity_type', Conversation.IdentityType.USER)
         current_sender_artist_profile = validated_data.get('initiator_artist_profile_instance', None)
 
-        recipient_user_id = validated_data.get('recipient_user_id')
-        recipient_artist_id = validated_data.get('recipient_artist_id')
-        
-        actual_recipient_user_model = None 
-        targeted_recipient_artist_profile = None
-        
-        if recipient_user_id:
-            try: actual_recipient_user_model = User.objects.get(id=recipient_user_id)
-            except User.DoesNotExist: return Response({"error": "Recipient user not found."}, status=status.HTTP_404_NOT_FOUND)
-        elif recipient_artist_id:
-            try:
-                targeted_recipient_artist_profile = Artist.objects.select_related('user').get(id=recipient_artist_id)
-                actual_recipient_user_model = targeted_recipient_artist_profile.user 
-            except Artist.DoesNotExist: return Response({"error": "Recipient artist not found."}, status=status.HTTP_404_NOT_FOUND)
-            except User.DoesNotExist: return Response({"error": "Artist owner user not found."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        else: return Response({"error": "No recipient specified."}, status=status.HTTP_400_BAD_REQUEST)
+        # Recipient instances are resolved by CreateMessageSerializer.validate() in one query.
+        actual_recipient_user_model = validated_data['recipient_user_instance']
+        targeted_recipient_artist_profile = validated_data['recipient_artist_instance']
 
         if current_sender_user == actual_recipient_user_model: 
             is_sender_user_identity = current_sender_identity_type == Conversation.IdentityType.USER
@@ -125,81 +233,57 @@ class ConversationViewSet(viewsets.ModelViewSet):
             if is_sender_artist_identity and current_sender_artist_profile and is_recipient_artist_target and current_sender_artist_profile == targeted_recipient_artist_profile: 
                 return Response({"error": "An artist profile cannot send a message to itself."}, status=status.HTTP_400_BAD_REQUEST)
         
-        conversations_between_users = Conversation.objects.annotate(
-            p_count=Count('participants')
-        ).filter(
-            p_count=2,
-            participants=current_sender_user
-        ).filter(
-            participants=actual_recipient_user_model
-        )
+        with transaction.atomic():
+            # The two endpoints identify the conversation in either direction; the unique
+            # participants_key turns the lookup into one indexed probe and makes concurrent
+            # first messages converge on a single conversation.
+            participants_key = Conversation.build_participants_key(
+                current_sender_user.pk, current_sender_artist_profile.pk if current_sender_artist_profile else None,
+                actual_recipient_user_model.pk, targeted_recipient_artist_profile.pk if targeted_recipient_artist_profile else None
+            )
+            found_conversation, created = Conversation.objects.select_related(
+                'initiator_user', 'initiator_artist_profile', 'related_artist_recipient'
+            ).get_or_create(
+                participants_key=participants_key,
+                defaults={
+                    'initiator_user': current_sender_user,
+                    'initiator_identity_type': current_sender_identity_type,
+                    'initiator_artist_profile': current_sender_artist_profile,
+                    'is_accepted': False,
+                    'related_artist_recipient': targeted_recipient_artist_profile,
+                }
+            )
 
-        found_conversation = None
-        for conv_candidate in conversations_between_users:
-            if conv_candidate.initiator_user == current_sender_user and \
-               conv_candidate.initiator_identity_type == current_sender_identity_type and \
-               conv_candidate.initiator_artist_profile == current_sender_artist_profile and \
-               conv_candidate.related_artist_recipient == targeted_recipient_artist_profile:
-                found_conversation = conv_candidate
-                break
-            
-            recipient_as_initiator_identity_type = Conversation.IdentityType.ARTIST if targeted_recipient_artist_profile else Conversation.IdentityType.USER
-            recipient_as_initiator_artist_profile = targeted_recipient_artist_profile 
-
-            if conv_candidate.initiator_user == actual_recipient_user_model and \
-               conv_candidate.initiator_identity_type == recipient_as_initiator_identity_type and \
-               conv_candidate.initiator_artist_profile == recipient_as_initiator_artist_profile and \
-               conv_candidate.related_artist_recipient == current_sender_artist_profile: 
-                found_conversation = conv_candidate
-                break
-        
-        if not found_conversation:
-            found_conversation = Conversation.objects.create(
-                initiator_user=current_sender_user, 
-                initiator_identity_type=current_sender_identity_type,
-                initiator_artist_profile=current_sender_artist_profile,
-                is_accepted=False, 
-                related_artist_recipient=targeted_recipient_artist_profile 
+            if created:
+                Participant = Conversation.participants.through
+                # Insert both through rows in one statement; the conversation is brand new,
+                # so the existence check done by participants.add() is unnecessary.
+                Participant.objects.bulk_create([
+                    Participant(conversation=found_conversation, user=current_sender_user),
+                    Participant(conversation=found_conversation, user=actual_recipient_user_model),
+                ])
+                logger.info(f"CREATED New Conversation (ID: {found_conversation.id}): "
+                            f"Initiator: {current_sender_user.username} (as {current_sender_identity_type}, ArtistID: {current_sender_artist_profile.id if current_sender_artist_profile else 'N/A'}), "
+                            f"Recipient User: {actual_recipient_user_model.username}, Recipient Artist Target: {targeted_recipient_artist_profile.name if targeted_recipient_artist_profile else 'N/A (User Target)'}")
+            else:
+                logger.info(f"FOUND Existing Conversation (ID: {found_conversation.id})")
+
+            new_message = Message( 
+                conversation=found_conversation,
+                sender_user=current_sender_user,
+                sender_identity_type=current_sender_identity_type, 
+                sending_artist=current_sender_artist_profile,
+                text=validated_data.get('text'),
+                attachment=validated_data.get('attachment'),
+                message_type=validated_data.get('message_type', Message.MessageType.TEXT),
+                shared_track=validated_data.get('shared_track') # Share permission checked by ShareableTrackField
             )
-            found_conversation.participants.add(current_sender_user, actual_recipient_user_model)
-            logger.info(f"CREATED New Conversation (ID: {found_conversation.id}): "
-                        f"Initiator: {current_sender_user.username} (as {current_sender_identity_type}, ArtistID: {current_sender_artist_profile.id if current_sender_artist_profile else 'N/A'}), "
-                        f"Recipient User: {actual_recipient_user_model.username}, Recipient Artist Target: {targeted_recipient_artist_profile.name if targeted_recipient_artist_profile else 'N/A (User Target)'}")
-        else:
-            logger.info(f"FOUND Existing Conversation (ID: {found_conversation.id})")
-
-        shared_track_instance = None
-        if validated_data.get('shared_track_id'):
-            try:
-                # Permission for sharing draft tracks:
-                # If the track's release artist is the current_sender_user, allow sharing even if draft.
-                # Otherwise, track must be part of a published release.
-                track_to_share = Track.objects.select_related('release__artist__user').get(pk=validated_data['shared_track_id'])
-                can_share_track = False
-                if track_to_share.release.is_visible(): # Publicly visible releases
-                    can_share_track = True
-                elif track_to_share.release.artist.user == current_sender_user: # Sender owns the track's release
-                    can_share_track = True
-                
-                if can_share_track:
-                    shared_track_instance = track_to_share
-                else:
-                    return Response({"shared_track_id": "This track cannot be shared at this time (e.g., it's a draft by another artist)."}, status=status.HTTP_400_BAD_REQUEST)
-            except Track.DoesNotExist:
-                return Response({"shared_track_id": "Track to share not found."}, status=status.HTTP_400_BAD_REQUEST)
-
-
-        new_message = Message( 
-            conversation=found_conversation,
-            sender_user=current_sender_user,
-            sender_identity_type=current_sender_identity_type, 
-            sending_artist=current_sender_artist_profile,
-            text=validated_data.get('text'),
-            attachment=validated_data.get('attachment'),
-            message_type=validated_data.get('message_type', Message.MessageType.TEXT),
-            shared_track=shared_track_instance # Assign shared track
-        )
-        new_message.save()
+            new_message.save()
+
+        # Everything ConversationSerializer reads is already in memory: fill the attributes the list view's
+        # prefetches would. The lookup above guarantees exactly these two participants.
+        found_conversation.prefetched_participants = [current_sender_user, actual_recipient_user_model]
+        found_conversation.prefetched_latest_messages = [new_message]
         
         conv_serializer = ConversationSerializer(found_conversation, context={'request': request})
         return Response(conv_serializer.data, status=status.HTTP_201_CREATED)
@@ -220,9 +304,9 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 message_sender_identity_type = Message.SenderIdentity.USER
                 message_sending_artist_instance = None
         else: 
+            # Ownership via the already-loaded FK id; hasattr(user, 'artist_profile') costs a query.
             if conversation.related_artist_recipient and \
-               hasattr(requesting_user, 'artist_profile') and \
-               requesting_user.artist_profile == conversation.related_artist_recipient:
+               conversation.related_artist_recipient.user_id == requesting_user.id:
                 message_sender_identity_type = Message.SenderIdentity.ARTIST
                 message_sending_artist_instance = conversation.related_artist_recipient
             else:
@@ -235,35 +319,20 @@ class ConversationViewSet(viewsets.ModelViewSet):
             'message_type': request.data.get('message_type', Message.MessageType.TEXT),
             'shared_track': request.data.get('shared_track_id') # Get shared_track_id for reply
         }
-
-        shared_track_instance_reply = None
-        if message_data_for_serializer['shared_track']:
-            try:
-                track_to_share = Track.objects.select_related('release__artist__user').get(pk=message_data_for_serializer['shared_track'])
-                can_share_track = False
-                if track_to_share.release.is_visible():
-                    can_share_track = True
-                elif track_to_share.release.artist.user == requesting_user:
-                    can_share_track = True
-                
-                if can_share_track:
-                    shared_track_instance_reply = track_to_share
-                else:
-                     return Response({"shared_track_id": "This track cannot be shared (reply)."}, status=status.HTTP_400_BAD_REQUEST)
-            except Track.DoesNotExist:
-                return Response({"shared_track_id": "Track to share not found (reply)."}, status=status.HTTP_400_BAD_REQUEST)
         
         message_serializer_context = {'request': request} 
         message_serializer = MessageSerializer(data=message_data_for_serializer, context=message_serializer_context)
         
         if message_serializer.is_valid():
-            message = message_serializer.save(
-                sender_user=requesting_user, 
-                conversation=conversation,
-                sender_identity_type=message_sender_identity_type, 
-                sending_artist=message_sending_artist_instance,
-                shared_track=shared_track_instance_reply # Pass validated shared_track instance
-            )
+            # The message insert and the conversation timestamp/accept update commit together.
+            with transaction.atomic():
+                message = message_serializer.save(
+                    sender_user=requesting_user, 
+                    conversation=conversation,
+                    sender_identity_type=message_sender_identity_type, 
+                    sending_artist=message_sending_artist_instance
+                )
+            conversation.prefetched_latest_messages = [message] # The prefetched preview is now stale
             conv_serializer = ConversationSerializer(conversation, context={'request': request})
             return Response(conv_serializer.data, status=status.HTTP_201_CREATED)
         return Response(message_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -271,44 +340,79 @@ class ConversationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='messages')
     def list_messages(self, request, pk=None):
         conversation = self.get_object() 
-        messages = conversation.messages.select_related(
-            'sender_user', 
-            'sending_artist', 
-            'shared_track__release__artist' # Prefetch for shared track details
-        ).all().order_by('timestamp')
+        messages = conversation.messages.all()
         
         can_mark_read = False
         if conversation.is_accepted:
             can_mark_read = True
-        elif conversation.initiator_user != request.user: 
+        elif conversation.initiator_user_id != request.user.id: 
             can_mark_read = True
 
-        if can_mark_read:
-            messages_to_mark_read = messages.filter(is_read=False).exclude(sender_user=request.user)
-            if messages_to_mark_read.exists(): 
-                 count_updated = messages_to_mark_read.update(is_read=True)
-                 logger.info(f"Marked {count_updated} messages as read in conversation {conversation.id} for user {request.user.username}")
-        
-        page = self.paginate_queryset(messages)
-        if page is not None:
-            serializer = MessageSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
+        # An unchanged ETag means this page was already returned, and marked read, in this state.
+        state = self._messages_state(conversation)
+        etag = self._messages_etag(conversation, request, state)
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            message_rows = messages.order_by('timestamp').values(*MESSAGE_LIST_VALUES)
+            page = self.paginate_queryset(message_rows)
+            rows = page if page is not None else list(message_rows)
 
-        serializer = MessageSerializer(messages, many=True, context={'request': request})
-        return Response(serializer.data)
+            if can_mark_read:
+                # Only the messages actually returned are marked read, bounding the UPDATE to one page.
+                unread_ids = {
+                    row['id'] for row in rows
+                    if not row['is_read'] and row['sender_user_id'] != request.user.id
+                }
+                if unread_ids:
+                    count_updated = Message.objects.filter(pk__in=unread_ids, is_read=False).update(is_read=True)
+                    if count_updated:
+                        logger.info(f"Marked {count_updated} messages as read in conversation {conversation.id} for user {request.user.username}")
+                    for row in rows:
+                        if row['id'] in unread_ids:
+                            row['is_read'] = True
+                    # The read-state change also changes the ETag; only the unread count moved, so no new aggregate is needed.
+                    state['unread'] -= count_updated
+                    etag = self._messages_etag(conversation, request, state)
+
+            if page is not None:
+                response = self.get_paginated_response(serialize_message_rows(rows, request))
+            else:
+                response = Response(serialize_message_rows(rows, request))
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        return response
+
+    def _messages_state(self, conversation):
+        return conversation.messages.aggregate(
+            latest_id=Max('id'),
+            total=Count('id'),
+            unread=Count('id', filter=Q(is_read=False))
+        )
+
+    def _messages_etag(self, conversation, request, state):
+        # Pages are marked read independently, so each page gets its own validator.
+        page_number = request.query_params.get(self.paginator.page_query_param, '1') if self.paginator else ''
+        return f'W/"{conversation.id}-{page_number}-{state["latest_id"] or 0}-{state["total"]}-{state["unread"]}"'
 
     @action(detail=True, methods=['post'], url_path='accept-request')
     def accept_request(self, request, pk=None):
         conversation = self.get_object() 
         
-        if conversation.initiator_user == request.user: 
+        if conversation.initiator_user_id == request.user.id: 
             return Response({"error": "You cannot accept a conversation you initiated."}, status=status.HTTP_400_BAD_REQUEST)
         
-        if conversation.is_accepted:
+        # Conditional UPDATE: concurrent accepts cannot both win, and no read-modify-write is needed.
+        accepted_at = timezone.now()
+        updated = Conversation.objects.filter(pk=conversation.pk, is_accepted=False).update(
+            is_accepted=True, updated_at=accepted_at
+        )
+        if not updated:
             return Response({"message": "Conversation already accepted."}, status=status.HTTP_200_OK)
         
         conversation.is_accepted = True
-        conversation.save(update_fields=['is_accepted', 'updated_at']) 
+        conversation.updated_at = accepted_at
         
         serializer = self.get_serializer(conversation)
         return Response(serializer.data)
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class InteractionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'interactions'
\ No newline at end of file
+    name = 'interactions'
+
+    def ready(self):
+        import interactions.signals # noqa
\ No newline at end of file
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['artist', '-created_at', '-id'], name='follow_artist_created_ix'),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='follow_user_created_ix'),
+        ),
+    ]
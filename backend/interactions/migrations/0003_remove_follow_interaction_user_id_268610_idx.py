@@ -0,0 +1,17 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0002_follow_follow_artist_created_ix_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='follow',
+            name='interaction_user_id_268610_idx',
+        ),
+    ]
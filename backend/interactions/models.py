@@ -1,6 +1,9 @@
 from django.db import models
 from django.conf import settings
 
+IS_FOLLOWING_CACHE_TIMEOUT = 60 * 60 # Seconds; entries are also rewritten whenever a Follow is created or deleted
+FOLLOWED_ARTIST_IDS_CACHE_TIMEOUT = 5 * 60 # Seconds; entries are also dropped whenever a Follow is created or deleted
+
 class Follow(models.Model):
     """
     Represents a User following an Artist.
@@ -22,9 +25,29 @@ class Follow(models.Model):
     class Meta:
         unique_together = ('user', 'artist') # A user can only follow an artist once
         ordering = ['-created_at']
+        # (user, artist) lookups use the unique constraint's index; a separate index would only duplicate it.
         indexes = [
-            models.Index(fields=['user', 'artist']),
+            # Seek indexes for the cursor-paginated follower/following listings.
+            models.Index(fields=['artist', '-created_at', '-id'], name='follow_artist_created_ix'),
+            models.Index(fields=['user', '-created_at', '-id'], name='follow_user_created_ix'),
         ]
 
     def __str__(self):
-        return f"{self.user.username} follows {self.artist.name}"
\ No newline at end of file
+        return f"{self.user.username} follows {self.artist.name}"
+
+    @staticmethod
+    def is_following_cache_key(user_id, artist_id):
+        return f"follow:{user_id}:{artist_id}"
+
+    @staticmethod
+    def deleted_artist_cache_key(artist_id):
+        # Set when an artist is deleted and kept as long as is-following entries live, so cached answers 404.
+        return f"follow_artist_deleted:{artist_id}"
+
+    @staticmethod
+    def followed_artist_ids_version_cache_key(user_id):
+        return f"follow_ids:version:{user_id}"
+
+    @staticmethod
+    def followed_artist_ids_cache_key(user_id, version):
+        return f"follow_ids:{user_id}:{version}"
\ No newline at end of file
@@ -3,8 +3,9 @@ from .models import Follow
 from users.serializers import BasicUserSerializer
 from music.serializers import ArtistSerializer as FullArtistSerializer # Renamed to avoid conflict if you use Artist locally
 from music.models import Artist
+from vaultwave.utils import CachedFieldsSerializerMixin
 
-class FollowSerializer(serializers.ModelSerializer):
+class FollowSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     user = BasicUserSerializer(read_only=True)
     artist = FullArtistSerializer(read_only=True) # Use the renamed import for clarity
     # For write operations, we'll likely use artist_id
@@ -36,7 +37,14 @@ class FollowSerializer(serializers.ModelSerializer):
             pass
         return follow
 
-class FollowerSerializer(serializers.ModelSerializer):
+class LightweightArtistSerializer(serializers.ModelSerializer):
+    """Just enough of an artist to render a follow listing; no user or nested relations."""
+    class Meta:
+        model = Artist
+        fields = ['id', 'name', 'artist_picture']
+
+
+class FollowerSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for displaying followers of an artist."""
     user = BasicUserSerializer(read_only=True)
 
@@ -45,9 +53,9 @@ class FollowerSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'created_at']
 
 
-class FollowingSerializer(serializers.ModelSerializer):
+class FollowingSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for displaying artists a user is following."""
-    artist = FullArtistSerializer(read_only=True) # Use the renamed import
+    artist = LightweightArtistSerializer(read_only=True)
 
     class Meta:
         model = Follow
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from music.models import Artist
+from .models import Follow, IS_FOLLOWING_CACHE_TIMEOUT
+
+# Artist.followers_count is kept in step with Follow rows using atomic F() updates,
+# so reading a follower count never needs a COUNT over the follows table.
+
+@receiver(post_save, sender=Follow)
+def increment_artist_followers_count(sender, instance: Follow, created: bool, **kwargs):
+    if created:
+        Artist.objects.filter(pk=instance.artist_id).update(followers_count=F('followers_count') + 1)
+        _cache_is_following_on_commit(instance, True)
+        _drop_followed_artist_ids_on_commit(instance)
+
+@receiver(post_delete, sender=Follow)
+def decrement_artist_followers_count(sender, instance: Follow, **kwargs):
+    Artist.objects.filter(pk=instance.artist_id, followers_count__gt=0).update(followers_count=F('followers_count') - 1)
+    _cache_is_following_on_commit(instance, False)
+    _drop_followed_artist_ids_on_commit(instance)
+
+@receiver(post_delete, sender=Artist)
+def mark_artist_deleted_for_follow_checks(sender, instance: Artist, **kwargs):
+    # is-following entries for this artist may outlive it; the marker makes check_is_following_artist 404 instead.
+    if not settings.CACHE_IS_SHARED:
+        return
+    key = Follow.deleted_artist_cache_key(instance.pk)
+    transaction.on_commit(lambda: cache.set(key, True, IS_FOLLOWING_CACHE_TIMEOUT))
+
+def _cache_is_following_on_commit(instance: Follow, is_following: bool):
+    if not settings.CACHE_IS_SHARED:
+        return
+    # Overwrite rather than delete the entry, so the next check_is_following_artist is still a cache hit.
+    key = Follow.is_following_cache_key(instance.user_id, instance.artist_id)
+    transaction.on_commit(lambda: cache.set(key, is_following, IS_FOLLOWING_CACHE_TIMEOUT))
+
+def _drop_followed_artist_ids_on_commit(instance: Follow):
+    if not settings.CACHE_IS_SHARED:
+        return
+    key = Follow.followed_artist_ids_version_cache_key(instance.user_id)
+    transaction.on_commit(lambda: cache.delete(key))
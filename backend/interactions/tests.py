@@ -1,3 +1,90 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.query import QuerySet
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from music.models import Artist
+from .models import Follow
+
+
+@override_settings(CACHE_IS_SHARED=True)
+class IsFollowingCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.fan = User.objects.create_user(username='follow_fan', password='testpassword')
+        cls.artist_user = User.objects.create_user(username='follow_artist', password='testpassword')
+
+    def setUp(self):
+        cache.clear()
+        self.artist = Artist.objects.create(user=self.artist_user, name='Followed Artist')
+        self.url = reverse('follow-check-is-following-artist', kwargs={'artist_pk': self.artist.pk})
+        self.client = APIClient()
+        self.client.force_authenticate(self.fan)
+
+    def is_following(self):
+        return self.client.get(self.url).data['is_following']
+
+    def test_follow_committed_during_a_miss_is_not_overwritten(self):
+        exists = QuerySet.exists
+
+        def exists_then_follow(queryset):
+            result = exists(queryset)
+            # A follow handled elsewhere commits after the view's read but before it caches the answer.
+            with self.captureOnCommitCallbacks(execute=True):
+                Follow.objects.create(user=self.fan, artist=self.artist)
+            return result
+
+        with mock.patch.object(QuerySet, 'exists', autospec=True, side_effect=exists_then_follow):
+            self.assertFalse(self.is_following())
+        with self.assertNumQueries(0):
+            self.assertTrue(self.is_following())
+
+    def test_deleted_artist_is_not_found_after_a_cache_hit(self):
+        self.assertFalse(self.is_following())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.artist.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+@override_settings(CACHE_IS_SHARED=True)
+class FollowedArtistIdsCacheTests(TestCase):
+    url = '/api/interactions/follows/my-following-ids/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fan = User.objects.create_user(username='ids_fan', password='testpassword')
+        cls.artist = Artist.objects.create(
+            user=User.objects.create_user(username='ids_artist', password='testpassword'), name='Ids Artist'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.fan)
+
+    def test_follow_committed_during_a_miss_is_not_lost(self):
+        fetch_all = QuerySet._fetch_all
+        followed = []
+
+        def fetch_then_follow(queryset):
+            fetch_all(queryset)
+            if queryset.model is Follow and not followed:
+                # A follow handled elsewhere commits after the view's read but before it caches the list.
+                with self.captureOnCommitCallbacks(execute=True):
+                    followed.append(Follow.objects.create(user=self.fan, artist=self.artist))
+
+        with mock.patch.object(QuerySet, '_fetch_all', autospec=True, side_effect=fetch_then_follow):
+            self.assertEqual(self.client.get(self.url).json(), [])
+        self.assertEqual(self.client.get(self.url).json(), [self.artist.pk])
+
+    def test_cached_until_follows_change(self):
+        self.assertEqual(self.client.get(self.url).json(), [])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Follow.objects.create(user=self.fan, artist=self.artist)
+        self.assertEqual(self.client.get(self.url).json(), [self.artist.pk])
@@ -1,13 +1,29 @@
 from django.urls import path, include
+from rest_framework import permissions
 from rest_framework.routers import DefaultRouter
 from .views import FollowViewSet
 
 router = DefaultRouter()
 router.register(r'follows', FollowViewSet, basename='follow')
-# The custom URL paths in FollowViewSet actions like 'artist/(?P<artist_pk>[0-9]+)/followers'
-# will be correctly appended to '/api/interactions/follows/'.
-# e.g. /api/interactions/follows/artist/1/followers/
+# The router handles the flat actions (follow-artist, my-following, ...).
+# Parameterised lookups are routed explicitly below with <int:> converters
+# instead of regex url_paths, e.g. /api/interactions/follows/artist/1/followers/
 
 urlpatterns = [
+    path(
+        'follows/artist/<int:artist_pk>/followers/',
+        FollowViewSet.as_view({'get': 'list_artist_followers'}, permission_classes=[permissions.AllowAny]),
+        name='follow-list-artist-followers',
+    ),
+    path(
+        'follows/artist/<int:artist_pk>/is-following/',
+        FollowViewSet.as_view({'get': 'check_is_following_artist'}, permission_classes=[permissions.IsAuthenticated]),
+        name='follow-check-is-following-artist',
+    ),
+    path(
+        'follows/user/<int:user_pk>/following/',
+        FollowViewSet.as_view({'get': 'list_user_following'}, permission_classes=[permissions.AllowAny]),
+        name='follow-list-user-following',
+    ),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,17 +1,34 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from .models import Follow
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from .models import Follow, IS_FOLLOWING_CACHE_TIMEOUT, FOLLOWED_ARTIST_IDS_CACHE_TIMEOUT
 from music.models import Artist
 from .serializers import FollowSerializer, FollowerSerializer, FollowingSerializer
 from django.contrib.auth import get_user_model # Use get_user_model for User
+import time
 
 User = get_user_model()
 
+MAX_ARE_FOLLOWING_ARTIST_IDS = 100
+
+# Columns read by FollowerSerializer / FollowingSerializer (and the cursor ordering); everything else is deferred.
+FOLLOWER_LIST_FIELDS = ('id', 'created_at', 'user__id', 'user__username')
+FOLLOWING_LIST_FIELDS = ('id', 'created_at', 'artist__id', 'artist__name', 'artist__artist_picture')
+
+class FollowCursorPagination(CursorPagination):
+    # Seeks on (created_at, id) instead of OFFSET, so deep pages of popular artists cost the same as the first.
+    ordering = ('-created_at', '-id')
+
 class FollowViewSet(viewsets.GenericViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = FollowSerializer # Default serializer
+    pagination_class = FollowCursorPagination
 
     def get_queryset(self):
         # This is mainly for DRF schema generation, specific actions will have their own queries
@@ -28,17 +45,27 @@ class FollowViewSet(viewsets.GenericViewSet):
         
         artist_to_follow = get_object_or_404(Artist, pk=artist_id)
         
-        if artist_to_follow.user == request.user:
+        if artist_to_follow.user_id == request.user.id:
             return Response({"detail": "You cannot follow your own artist profile."}, status=status.HTTP_400_BAD_REQUEST)
 
-        follow_instance, created = Follow.objects.get_or_create(user=request.user, artist=artist_to_follow)
+        # Insert first and let the (user, artist) unique constraint detect an existing follow,
+        # instead of a SELECT before every INSERT. The savepoint keeps the outer transaction usable.
+        try:
+            with transaction.atomic():
+                follow_instance = Follow.objects.create(user=request.user, artist=artist_to_follow)
+        except IntegrityError:
+            return Response({"detail": "You are already following this artist."}, status=status.HTTP_200_OK)
 
-        if created:
-            # TODO: Create a notification for the followed artist (will do this in a later step)
-            # from notifications.utils import create_notification (example)
-            # create_notification(recipient=artist_to_follow.user, actor=request.user, verb='started following you', target=artist_to_follow)
-            return Response(FollowSerializer(follow_instance, context={'request': request}).data, status=status.HTTP_201_CREATED)
-        return Response({"detail": "You are already following this artist."}, status=status.HTTP_200_OK)
+        # TODO: Create a notification for the followed artist (will do this in a later step)
+        # from notifications.utils import create_notification (example)
+        # create_notification(recipient=artist_to_follow.user, actor=request.user, verb='started following you', target=artist_to_follow)
+        # The client already knows the artist; a flat payload skips nested artist/user serialization.
+        payload = {
+            'id': follow_instance.id,
+            'artist_id': artist_to_follow.pk,
+            'created_at': follow_instance.created_at.isoformat(),
+        }
+        return Response(payload, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['post'], url_path='unfollow-artist')
     def unfollow_artist(self, request):
@@ -49,22 +76,20 @@ class FollowViewSet(viewsets.GenericViewSet):
         if not artist_id:
             return Response({"artist_id": "This field is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        artist_to_unfollow = get_object_or_404(Artist, pk=artist_id)
-        
-        try:
-            follow_instance = Follow.objects.get(user=request.user, artist=artist_to_unfollow)
-            follow_instance.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except Follow.DoesNotExist:
+        # One filtered delete; an unknown artist simply has no follow to remove.
+        # Follow's post_delete receivers still update followers_count and the is-following cache.
+        deleted_count, _ = Follow.objects.filter(user=request.user, artist_id=artist_id).delete()
+        if not deleted_count:
             return Response({"detail": "You are not following this artist."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-    @action(detail=False, methods=['get'], url_path='artist/(?P<artist_pk>[0-9]+)/followers', permission_classes=[permissions.AllowAny])
+    # Routed explicitly in urls.py with an <int:> path converter rather than a regex @action.
     def list_artist_followers(self, request, artist_pk=None):
         """
         List users following a specific artist.
         """
         artist = get_object_or_404(Artist, pk=artist_pk)
-        followers = Follow.objects.filter(artist=artist).select_related('user__profile')
+        followers = Follow.objects.filter(artist=artist).select_related('user').only(*FOLLOWER_LIST_FIELDS)
         page = self.paginate_queryset(followers)
         if page is not None:
             serializer = FollowerSerializer(page, many=True, context={'request': request})
@@ -72,13 +97,13 @@ class FollowViewSet(viewsets.GenericViewSet):
         serializer = FollowerSerializer(followers, many=True, context={'request': request})
         return Response(serializer.data)
         
-    @action(detail=False, methods=['get'], url_path='user/(?P<user_pk>[0-9]+)/following', permission_classes=[permissions.AllowAny])
+    # Routed explicitly in urls.py.
     def list_user_following(self, request, user_pk=None):
         """
         List artists a specific user is following.
         """
         user_to_check = get_object_or_404(User, pk=user_pk)
-        following = Follow.objects.filter(user=user_to_check).select_related('artist')
+        following = Follow.objects.filter(user=user_to_check).select_related('artist').only(*FOLLOWING_LIST_FIELDS)
         page = self.paginate_queryset(following)
         if page is not None:
             serializer = FollowingSerializer(page, many=True, context={'request': request})
@@ -90,7 +115,7 @@ class FollowViewSet(viewsets.GenericViewSet):
     def list_my_following(self, request):
         """List artists the authenticated user is following."""
         user = request.user
-        following = Follow.objects.filter(user=user).select_related('artist')
+        following = Follow.objects.filter(user=user).select_related('artist').only(*FOLLOWING_LIST_FIELDS)
         page = self.paginate_queryset(following)
         if page is not None:
             serializer = FollowingSerializer(page, many=True, context={'request': request})
@@ -98,9 +123,70 @@ class FollowViewSet(viewsets.GenericViewSet):
         serializer = FollowingSerializer(following, many=True, context={'request': request})
         return Response(serializer.data)
 
-    @action(detail=False, methods=['get'], url_path='artist/(?P<artist_pk>[0-9]+)/is-following', permission_classes=[permissions.IsAuthenticated])
+    @action(detail=False, methods=['get'], url_path='my-following-ids')
+    def list_my_following_ids(self, request):
+        """
+        List just the ids of the artists the authenticated user is following (for follow-button state).
+        Use my-following for the artist details.
+        """
+        user_id = request.user.pk
+        fetch_artist_ids = lambda: list(Follow.objects.filter(user_id=user_id).values_list('artist_id', flat=True))
+        if not settings.CACHE_IS_SHARED:
+            return Response(fetch_artist_ids())
+        # Versioned like the library list: the version is read before the query, and Follow signals drop it.
+        # A follow/unfollow committing after the query leaves this list under a version no later request reads.
+        version = cache.get_or_set(
+            Follow.followed_artist_ids_version_cache_key(user_id), time.time_ns, FOLLOWED_ARTIST_IDS_CACHE_TIMEOUT
+        )
+        cache_key = Follow.followed_artist_ids_cache_key(user_id, version)
+        artist_ids = cache.get(cache_key)
+        if artist_ids is None:
+            artist_ids = fetch_artist_ids()
+            cache.add(cache_key, artist_ids, FOLLOWED_ARTIST_IDS_CACHE_TIMEOUT)
+        return Response(artist_ids)
+
+    @action(detail=False, methods=['post'], url_path='are-following')
+    def check_are_following_artists(self, request):
+        """
+        Check which of several artists the authenticated user follows.
+        Requires 'artist_ids' (a list of up to 100 ids); returns {artist_id: bool}.
+        """
+        artist_ids = request.data.get('artist_ids')
+        # type() rather than isinstance(): JSON true/false arrive as bool, an int subclass, and are not artist ids.
+        if not isinstance(artist_ids, list) or not all(type(artist_id) is int for artist_id in artist_ids):
+            return Response({"artist_ids": "A list of artist ids is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(artist_ids) > MAX_ARE_FOLLOWING_ARTIST_IDS:
+            return Response({"artist_ids": f"At most {MAX_ARE_FOLLOWING_ARTIST_IDS} artist ids can be checked at once."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Answer what the per-artist cache already knows, then resolve the rest with one IN query.
+        cache_keys = {Follow.is_following_cache_key(request.user.pk, artist_id): artist_id for artist_id in artist_ids}
+        cached = cache.get_many(list(cache_keys)) if settings.CACHE_IS_SHARED else {}
+        result = {cache_keys[key]: is_following for key, is_following in cached.items()}
+        uncached_ids = [artist_id for artist_id in artist_ids if artist_id not in result]
+        if uncached_ids:
+            followed_ids = set(
+                Follow.objects.filter(user=request.user, artist_id__in=uncached_ids).values_list('artist_id', flat=True)
+            )
+            result.update({artist_id: artist_id in followed_ids for artist_id in uncached_ids})
+        return Response({str(artist_id): result[artist_id] for artist_id in artist_ids})
+
+    # Routed explicitly in urls.py.
     def check_is_following_artist(self, request, artist_pk=None):
         """Check if the authenticated user is following a specific artist."""
-        artist = get_object_or_404(Artist, pk=artist_pk)
-        is_following = Follow.objects.filter(user=request.user, artist=artist).exists()
+        # Served from the shared cache when possible; signals keep the entry in step with Follow rows.
+        cache_key = Follow.is_following_cache_key(request.user.pk, artist_pk)
+        is_following = None
+        if settings.CACHE_IS_SHARED:
+            deleted_key = Follow.deleted_artist_cache_key(artist_pk)
+            cached = cache.get_many([cache_key, deleted_key])
+            if cached.get(deleted_key):
+                raise Http404
+            is_following = cached.get(cache_key)
+        if is_following is None:
+            artist = get_object_or_404(Artist, pk=artist_pk)
+            is_following = Follow.objects.filter(user=request.user, artist=artist).exists()
+            if settings.CACHE_IS_SHARED:
+                # add(), not set(): a follow/unfollow committed since the read above has already stored
+                # the newer answer, and only the signal handlers may overwrite an entry.
+                cache.add(cache_key, is_following, IS_FOLLOWING_CACHE_TIMEOUT)
         return Response({'is_following': is_following})
\ No newline at end of file
@@ -1,15 +1,25 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.conf import settings
 # from music.models import Release # Use string reference to avoid circular import
 
+# Acquisition types, named so callers don't index into ACQUISITION_CHOICES.
+ACQUISITION_FREE = 'FREE'
+ACQUISITION_PURCHASED = 'PURCHASED'
+ACQUISITION_NYP = 'NYP'
+
+# Seconds. A user's cached library list is dropped whenever their items or the releases/tracks it shows change;
+# the list is only cached when settings.CACHE_IS_SHARED, so every process sees those invalidations.
+LIBRARY_LIST_CACHE_TIMEOUT = 5 * 60
+
 class UserLibraryItem(models.Model):
     """
     Represents a Release that a User has added to their library.
     """
     ACQUISITION_CHOICES = [
-        ('FREE', 'Free Acquisition'),
-        ('PURCHASED', 'Purchased'),
-        ('NYP', 'Name Your Price'), 
+        (ACQUISITION_FREE, 'Free Acquisition'),
+        (ACQUISITION_PURCHASED, 'Purchased'),
+        (ACQUISITION_NYP, 'Name Your Price'), 
         # Could add 'GIFTED', 'PROMO', etc. in the future
     ]
 
@@ -27,7 +37,7 @@ class UserLibraryItem(models.Model):
     acquisition_type = models.CharField(
         max_length=20, 
         choices=ACQUISITION_CHOICES, 
-        default='FREE' # Default, can be updated upon purchase
+        default=ACQUISITION_FREE # Default, can be updated upon purchase
     )
     # You could add a reference to an OrderItem if acquired via purchase
     # order_item = models.OneToOneField('shop.OrderItem', on_delete=models.SET_NULL, null=True, blank=True)
@@ -36,6 +46,49 @@ class UserLibraryItem(models.Model):
     def __str__(self):
         return f"'{self.release.title}' in {self.user.username}'s library"
 
+    @staticmethod
+    def list_version_cache_key(user_id):
+        return f"library:version:{user_id}"
+
+    @staticmethod
+    def list_cache_key(user_id, version, site_root):
+        # The payload holds absolute URLs, so it is cached per site root as well.
+        return f"library:list:{user_id}:{version}:{site_root}"
+
+    @staticmethod
+    def invalidate_list_cache(user_id):
+        """Starts a new list version for the user once the current transaction commits."""
+        if not settings.CACHE_IS_SHARED:
+            return
+        key = UserLibraryItem.list_version_cache_key(user_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    @staticmethod
+    def invalidate_list_caches_of_holders(**item_filter):
+        """
+        Starts a new list version, once the current transaction commits, for every user with an item
+        matching `item_filter` (e.g. release_id=...), so edits to what their lists show appear at once.
+        """
+        if not settings.CACHE_IS_SHARED:
+            return
+        def drop_versions():
+            user_ids = UserLibraryItem.objects.filter(**item_filter).order_by().values_list('user_id', flat=True).distinct()
+            cache.delete_many([UserLibraryItem.list_version_cache_key(user_id) for user_id in user_ids])
+        transaction.on_commit(drop_versions)
+
+    @staticmethod
+    def invalidate_list_caches_of_holders_before_delete(**item_filter):
+        """
+        Like invalidate_list_caches_of_holders, for a deletion that cascades to the matching items:
+        the holders are read now, before the cascade removes them, and their versions dropped on commit.
+        """
+        if not settings.CACHE_IS_SHARED:
+            return
+        user_ids = UserLibraryItem.objects.filter(**item_filter).order_by().values_list('user_id', flat=True).distinct()
+        keys = [UserLibraryItem.list_version_cache_key(user_id) for user_id in user_ids]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
     class Meta:
         ordering = ['-acquired_at']
         unique_together = ('user', 'release') # User can only have a release once in their library
@@ -1,8 +1,12 @@
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from .models import UserLibraryItem
-from music.serializers import ReleaseSerializer # To nest release details
+from music.models import Release, Track
+from music.serializers import ReleaseSerializer, TrackSerializer, available_download_formats # To nest release details
+from users.serializers import ArtistSummarySerializer
+from vaultwave.utils import CachedFieldsSerializerMixin
 
-class UserLibraryItemSerializer(serializers.ModelSerializer):
+class UserLibraryItemSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField()
     # Nest the full release details for easy display in the library
     release = ReleaseSerializer(read_only=True) 
@@ -28,6 +32,94 @@ class UserLibraryItemSerializer(serializers.ModelSerializer):
         # 'acquisition_type' can be passed or defaulted in the view
         return UserLibraryItem.objects.create(**validated_data)
 
+# Slim variants for the library list: only what the library page plays and displays,
+# with no genres or per-track release back-references to hydrate.
+LIBRARY_TRACK_FIELDS = ['id', 'title', 'track_number', 'stream_url', 'duration_in_seconds', 'codec_name', 'is_lossless']
+
+class LibraryTrackSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    stream_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Track
+        fields = LIBRARY_TRACK_FIELDS
+
+    get_stream_url = TrackSerializer.get_stream_url
+
+class LibraryReleaseSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    artist = ArtistSummarySerializer(read_only=True)
+    tracks = LibraryTrackSerializer(many=True, read_only=True)
+    available_download_formats = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Release
+        fields = ['id', 'title', 'artist', 'release_type', 'release_date', 'cover_art', 'pricing_model', 'tracks', 'available_download_formats']
+
+    # Reads is_lossless/codec_name from the serialized tracks, which LIBRARY_TRACK_FIELDS keeps.
+    get_available_download_formats = ReleaseSerializer.get_available_download_formats
+
+class LibraryListSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    user = serializers.StringRelatedField()
+    release = LibraryReleaseSerializer(read_only=True)
+
+    class Meta:
+        model = UserLibraryItem
+        fields = ['id', 'user', 'release', 'acquired_at', 'acquisition_type']
+
+# Columns the library list reads, as `.values()` lookups from UserLibraryItem.
+LIBRARY_LIST_VALUES = (
+    'id', 'user__username', 'acquired_at', 'acquisition_type', 'release_id',
+    'release__title', 'release__artist_id', 'release__artist_name_cached', 'release__release_type',
+    'release__release_date', 'release__cover_art', 'release__pricing_model',
+)
+
+def serialize_library_items(rows, request=None):
+    """
+    Read-only fast path for the library list. Builds the same payload shape as
+    LibraryListSerializer from `.values(*LIBRARY_LIST_VALUES)` rows plus one
+    `.values()` query for their tracks, without instantiating model instances
+    or per-row serializers.
+    """
+    rows = list(rows)
+    datetime_field = serializers.DateTimeField()
+    cover_art_storage = Release._meta.get_field('cover_art').storage
+
+    tracks_by_release = {}
+    track_rows = Track.objects.filter(release_id__in={row['release_id'] for row in rows})\
+        .order_by('release_id', 'track_number')\
+        .values('release_id', *(field for field in LIBRARY_TRACK_FIELDS if field != 'stream_url'))
+    for track in track_rows:
+        # stream_url is None without a request, as in TrackSerializer.get_stream_url.
+        track['stream_url'] = reverse('track-stream', kwargs={'track_id': track['id']}, request=request) if request else None
+        # Same key order as LibraryTrackSerializer.
+        tracks_by_release.setdefault(track['release_id'], []).append({field: track[field] for field in LIBRARY_TRACK_FIELDS})
+
+    data = []
+    for row in rows:
+        tracks = tracks_by_release.get(row['release_id'], [])
+        cover_art_url = None
+        if row['release__cover_art']:
+            cover_art_url = cover_art_storage.url(row['release__cover_art'])
+            if request:
+                cover_art_url = request.build_absolute_uri(cover_art_url)
+        data.append({
+            'id': row['id'],
+            'user': row['user__username'],
+            'release': {
+                'id': row['release_id'],
+                'title': row['release__title'],
+                'artist': {'id': row['release__artist_id'], 'name': row['release__artist_name_cached']},
+                'release_type': row['release__release_type'],
+                'release_date': datetime_field.to_representation(row['release__release_date']),
+                'cover_art': cover_art_url,
+                'pricing_model': row['release__pricing_model'],
+                'tracks': tracks,
+                'available_download_formats': available_download_formats(tracks),
+            },
+            'acquired_at': datetime_field.to_representation(row['acquired_at']),
+            'acquisition_type': row['acquisition_type'],
+        })
+    return data
+
 class AddToLibrarySerializer(serializers.Serializer):
     release_id = serializers.IntegerField(required=True)
     # Optional: allow specifying acquisition_type if not always 'FREE' initially
@@ -36,8 +128,14 @@ class AddToLibrarySerializer(serializers.Serializer):
         default='FREE', 
         required=False
     )
-    def validate_release_id(self, value):
-        from music.models import Release # Local import
-        if not Release.objects.filter(pk=value).exists():
-            raise serializers.ValidationError("Release with this ID does not exist.")
-        return value
\ No newline at end of file
+    # Existence of release_id is checked by the view's single Release lookup (404 when missing).
+
+MAX_ADD_ITEMS_RELEASE_IDS = 100
+
+class AddItemsToLibrarySerializer(serializers.Serializer):
+    # Bulk additions are always FREE; purchases/NYP reach the library through order completion.
+    release_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=MAX_ADD_ITEMS_RELEASE_IDS
+    )
\ No newline at end of file
@@ -0,0 +1,50 @@
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from music.models import Artist, Release, Track
+from .models import UserLibraryItem
+from .serializers import LIBRARY_LIST_VALUES, LIBRARY_TRACK_FIELDS
+
+# Additions and acquisition-type upgrades (including those made by shop order completion)
+# drop the user's cached library list. There is deliberately no post_delete receiver: it
+# would stop remove-item's conditional DELETE from being a single statement, so that view
+# invalidates explicitly instead.
+
+@receiver(post_save, sender=UserLibraryItem)
+def invalidate_library_list_on_save(sender, instance: UserLibraryItem, **kwargs):
+    UserLibraryItem.invalidate_list_cache(instance.user_id)
+
+# Edits to what the list shows drop the cached lists of everyone holding the release. Saves whose
+# update_fields miss every listed column (e.g. listen counts) leave them alone.
+LISTED_RELEASE_FIELDS = frozenset(
+    {value[len('release__'):] for value in LIBRARY_LIST_VALUES if value.startswith('release__')} | {'artist'}
+)
+LISTED_TRACK_FIELDS = frozenset(LIBRARY_TRACK_FIELDS) - {'stream_url'} | {'release', 'release_id'}
+
+@receiver(post_save, sender=Artist)
+def invalidate_library_lists_on_artist_rename(sender, instance, created, update_fields=None, **kwargs):
+    # The rename reaches Release.artist_name_cached through a queryset update, which sends no post_save.
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    UserLibraryItem.invalidate_list_caches_of_holders(release__artist_id=instance.pk)
+
+@receiver(post_save, sender=Release)
+def invalidate_library_lists_on_release_save(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not LISTED_RELEASE_FIELDS & set(update_fields)):
+        return
+    UserLibraryItem.invalidate_list_caches_of_holders(release_id=instance.pk)
+
+@receiver(post_save, sender=Track)
+def invalidate_library_lists_on_track_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not LISTED_TRACK_FIELDS & set(update_fields):
+        return
+    UserLibraryItem.invalidate_list_caches_of_holders(release_id=instance.release_id)
+
+@receiver(post_delete, sender=Track)
+def invalidate_library_lists_on_track_delete(sender, instance, **kwargs):
+    UserLibraryItem.invalidate_list_caches_of_holders(release_id=instance.release_id)
+
+# Deleting a release cascades to the library items themselves, so the holders are read in pre_delete.
+# Artist deletions are covered too: the collector sends pre_delete for each cascaded release before deleting rows.
+@receiver(pre_delete, sender=Release)
+def invalidate_library_lists_on_release_delete(sender, instance, **kwargs):
+    UserLibraryItem.invalidate_list_caches_of_holders_before_delete(release_id=instance.pk)
@@ -1,3 +1,47 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from music.models import Artist, Release
+from .models import UserLibraryItem
+
+
+@override_settings(CACHE_IS_SHARED=True)
+class LibraryListCacheDeletionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.holder = User.objects.create_user(username='library_holder', password='testpassword')
+        cls.artist_user = User.objects.create_user(username='library_artist', password='testpassword')
+
+    def setUp(self):
+        cache.clear()
+        self.artist = Artist.objects.create(user=self.artist_user, name='Library Artist')
+        self.kept = Release.objects.create(artist=self.artist, title='Kept Release', pricing_model='FREE')
+        self.deleted = Release.objects.create(artist=self.artist, title='Deleted Release', pricing_model='FREE')
+        UserLibraryItem.objects.create(user=self.holder, release=self.kept)
+        UserLibraryItem.objects.create(user=self.holder, release=self.deleted)
+        self.client = APIClient()
+        self.client.force_authenticate(self.holder)
+
+    def list_release_titles(self):
+        return {item['release']['title'] for item in self.client.get('/api/library/').json()}
+
+    def test_deleting_a_held_release_drops_the_cached_list(self):
+        self.assertEqual(self.list_release_titles(), {'Kept Release', 'Deleted Release'})
+        etag = self.client.get('/api/library/')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deleted.delete()
+
+        response = self.client.get('/api/library/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({item['release']['title'] for item in response.json()}, {'Kept Release'})
+
+    def test_deleting_an_artist_drops_the_cached_list(self):
+        self.assertEqual(len(self.list_release_titles()), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.artist.delete()
+
+        self.assertEqual(self.list_release_titles(), set())
@@ -1,103 +1,200 @@
-from rest_framework import viewsets, status, permissions
+from rest_framework import viewsets, mixins, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-
-from .models import UserLibraryItem
-from music.models import Release, GeneratedDownload 
-from .serializers import UserLibraryItemSerializer, AddToLibrarySerializer
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Q, prefetch_related_objects
+import logging
+import time
+
+from .models import UserLibraryItem, ACQUISITION_FREE, ACQUISITION_PURCHASED, ACQUISITION_NYP, LIBRARY_LIST_CACHE_TIMEOUT
+from music.models import Artist, Genre, Release, Track, GeneratedDownload 
+from .serializers import (
+    UserLibraryItemSerializer, LibraryListSerializer, AddToLibrarySerializer, AddItemsToLibrarySerializer,
+    LIBRARY_LIST_VALUES, serialize_library_items
+)
 
 from music.serializers import GeneratedDownloadRequestSerializer, GeneratedDownloadStatusSerializer
-from music.tasks import generate_release_download_zip
+from music.tasks import request_release_download_zip
+
+logger = logging.getLogger(__name__)
+
 
+def _release_detail_prefetches(prefix=''):
+    """
+    Prefetches for rendering a release with the full ReleaseSerializer; `prefix` is the lookup path to the release.
+    Genres are pinned to the columns GenreSerializer renders; the M2M through tables' own
+    (release_id, genre_id) / (track_id, genre_id) unique indexes serve the IN (...) prefetches.
+    """
+    serialized_genres = Genre.objects.only('id', 'name')
+    return [
+        Prefetch(f'{prefix}genres', queryset=serialized_genres),
+        Prefetch(f'{prefix}tracks', queryset=Track.objects.prefetch_related(Prefetch('genres', queryset=serialized_genres))),
+    ]
 
-class LibraryViewSet(viewsets.GenericViewSet):
+
+class LibraryViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UserLibraryItemSerializer
 
     def get_queryset(self):
-        return UserLibraryItem.objects.filter(user=self.request.user)\
-            .select_related('release__artist')\
-            .prefetch_related(
-                'release__genres', 
-                'release__tracks__genres' 
-            )
+        queryset = UserLibraryItem.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            # Plain rows for serialize_library_items, which fetches the tracks itself; no genre tiers are loaded.
+            return queryset.values(*LIBRARY_LIST_VALUES)
+        # Detail views render the full ReleaseSerializer, so every release/artist column is loaded;
+        # of the two joined users only the username (their string form) is read.
+        return queryset\
+            .select_related('user', 'release__artist__user', 'release__product_info')\
+            .only(
+                'id', 'acquired_at', 'acquisition_type', 'user__username',
+                *(f'release__{field.name}' for field in Release._meta.concrete_fields),
+                *(f'release__artist__{field.name}' for field in Artist._meta.concrete_fields if field.name != 'user'),
+                'release__artist__user__username', 'release__product_info__id'
+            )\
+            .prefetch_related(*_release_detail_prefetches('release__'))
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return LibraryListSerializer
+        return super().get_serializer_class()
 
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = UserLibraryItemSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        # The list is versioned per user: saving or removing a library item, or editing a release/track it shows,
+        # starts a new version. Invalidations must reach every process, so nothing is cached without a shared cache.
+        if not settings.CACHE_IS_SHARED:
+            return Response(serialize_library_items(self.get_queryset(), request))
+        user_id = request.user.pk
+        version = cache.get_or_set(UserLibraryItem.list_version_cache_key(user_id), time.time_ns, LIBRARY_LIST_CACHE_TIMEOUT)
+        etag = f'W/"library-{user_id}-{version}"'
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            list_cache_key = UserLibraryItem.list_cache_key(user_id, version, request.build_absolute_uri('/'))
+            data = cache.get(list_cache_key)
+            if data is None:
+                # LibraryListSerializer documents the payload; serialize_library_items builds it from plain rows.
+                data = serialize_library_items(self.get_queryset(), request)
+                cache.set(list_cache_key, data, LIBRARY_LIST_CACHE_TIMEOUT)
+            response = Response(data)
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        return response
 
     @action(detail=False, methods=['post'], url_path='add-item', serializer_class=AddToLibrarySerializer)
     def add_item_to_library(self, request):
-        print(f"DEBUG: add_item_to_library received data: {request.data}") 
+        # %-style arguments: nothing is formatted unless DEBUG logging is enabled.
+        logger.debug("add_item_to_library received data: %s", request.data)
 
         serializer = AddToLibrarySerializer(data=request.data)
         if serializer.is_valid():
             release_id = serializer.validated_data['release_id']
             # Default to FREE if not provided, or if you want to enforce only FREE additions here.
             # For purchased items, they should be added via the order completion signal/logic.
-            acquisition_type = serializer.validated_data.get('acquisition_type', UserLibraryItem.ACQUISITION_CHOICES[0][0]) # Default to FREE
+            acquisition_type = serializer.validated_data.get('acquisition_type', ACQUISITION_FREE)
 
             try:
-                release_to_add = Release.objects.get(pk=release_id)
+                # The artist's user and product info are joined here because the response renders them.
+                release_to_add = Release.objects.select_related('artist__user', 'product_info').get(pk=release_id)
             except Release.DoesNotExist: 
                 return Response({'detail': 'Release not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-            can_acquire = release_to_add.is_visible()
-            if request.user.is_authenticated and hasattr(release_to_add.artist, 'user') and release_to_add.artist.user == request.user:
-                 can_acquire = True 
-            if request.user.is_staff:
-                 can_acquire = True
-            
-            # Ensure only FREE items or items by the artist themselves can be added via this specific endpoint
-            # if acquisition_type != UserLibraryItem.ACQUISITION_CHOICES[0][0] and not (hasattr(release_to_add.artist, 'user') and release_to_add.artist.user == request.user):
-            #     print(f"DEBUG: add_item_to_library - Attempt to add non-FREE item {release_id} via generic add. Acquisition type: {acquisition_type}")
-            #     return Response({'detail': 'Priced items are added to library upon acquisition.'}, status=status.HTTP_400_BAD_REQUEST)
-
+            # Owners and staff may always add; only other users need the visibility check.
+            can_acquire = (
+                request.user.is_staff
+                or release_to_add.artist.user_id == request.user.id
+                or release_to_add.is_visible()
+            )
 
             if not can_acquire :
-                print(f"DEBUG: add_item_to_library - can_acquire is False for release {release_id}. is_visible: {release_to_add.is_visible()}")
+                logger.debug("add_item_to_library - can_acquire is False for release %s (not visible).", release_id)
                 return Response({'detail': 'This release cannot be added to the library at this time.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            library_item, created = UserLibraryItem.objects.get_or_create(
-                user=request.user,
-                release=release_to_add,
-                defaults={'acquisition_type': acquisition_type}
-            )
-
-            if created:
-                item_serializer = UserLibraryItemSerializer(library_item, context={'request': request})
-                return Response(item_serializer.data, status=status.HTTP_201_CREATED)
-            else:
-                # If item already exists, and type is different (e.g. was FREE, now acquired as PURCHASED), update it.
-                # This might be better handled by the order creation logic itself ensuring the correct type.
-                # For this endpoint, if it exists, we probably don't want to change its acquisition_type here
-                # unless it's a specific scenario (e.g., upgrading a FREE to PURCHASED if logic allows).
-                # For now, if it exists, and the type is different, we could update it, or just return the existing.
-                if library_item.acquisition_type != acquisition_type and acquisition_type == UserLibraryItem.ACQUISITION_CHOICES[0][0]: 
-                    # Only allow updating to FREE here if it was something else and now it's explicitly being added as FREE.
-                    # This is a bit complex, might be simpler to not change type here.
-                    pass # For now, don't change if it exists through this specific 'add-item' endpoint,
-                         # as purchases/NYP handle their own library addition.
-                
-                item_serializer = UserLibraryItemSerializer(library_item, context={'request': request})
-                return Response(item_serializer.data, status=status.HTTP_200_OK)
+            # Insert first; the (user, release) unique constraint reports an existing item,
+            # which is only then read back. New additions skip the up-front SELECT.
+            try:
+                with transaction.atomic():
+                    library_item = UserLibraryItem.objects.create(
+                        user=request.user,
+                        release=release_to_add,
+                        acquisition_type=acquisition_type
+                    )
+                created = True
+            except IntegrityError:
+                library_item = UserLibraryItem.objects.get(user=request.user, release=release_to_add)
+                library_item.release = release_to_add # Already loaded with its artist; avoids refetching for the response
+                library_item.user = request.user
+                created = False
+
+            # Genres and tracks are loaded only once the release is known to be acquirable.
+            prefetch_related_objects([release_to_add], *_release_detail_prefetches())
+
+            # An existing item is returned unchanged: purchases/NYP handle their own library addition,
+            # and overwriting their acquisition_type with FREE here would make them removable.
+            item_serializer = UserLibraryItemSerializer(library_item, context={'request': request})
+            return Response(item_serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
         else:
-            print(f"DEBUG: AddToLibrarySerializer errors: {serializer.errors}") 
+            logger.debug("AddToLibrarySerializer errors: %s", serializer.errors) 
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], url_path='add-items')
+    def add_items_to_library(self, request):
+        """
+        Add several releases to the library as FREE items in one request.
+        Requires 'release_ids'; reports which were added, which were already there
+        and which can't be added (missing or not visible).
+        """
+        serializer = AddItemsToLibrarySerializer(data=request.data)
+        if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        release_ids = list(dict.fromkeys(serializer.validated_data['release_ids']))
+
+        # The same rule as add_item_to_library, evaluated in SQL for all ids at once.
+        acquirable = Release.objects.filter(pk__in=release_ids)
+        if not request.user.is_staff:
+            acquirable = acquirable.filter(Q(artist__user=request.user) | Release.visible_q())
+        acquirable_ids = set(acquirable.order_by().values_list('id', flat=True))
+
+        existing_ids = set(
+            UserLibraryItem.objects.filter(user=request.user, release_id__in=acquirable_ids).order_by().values_list('release_id', flat=True)
+        )
+        new_ids = [release_id for release_id in release_ids if release_id in acquirable_ids and release_id not in existing_ids]
+        if new_ids:
+            # ignore_conflicts covers items added concurrently since the check above.
+            UserLibraryItem.objects.bulk_create(
+                [UserLibraryItem(user=request.user, release_id=release_id, acquisition_type=ACQUISITION_FREE) for release_id in new_ids],
+                ignore_conflicts=True
+            )
+            # bulk_create sends no post_save, so drop the cached list here.
+            UserLibraryItem.invalidate_list_cache(request.user.pk)
+
+        return Response({
+            'added': new_ids,
+            'already_in_library': [release_id for release_id in release_ids if release_id in existing_ids],
+            'unavailable': [release_id for release_id in release_ids if release_id not in acquirable_ids],
+        }, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['delete'], url_path='remove-item') 
     def remove_item_from_library(self, request, pk=None): 
-        library_item = get_object_or_404(UserLibraryItem, pk=pk, user=request.user)
-        
-        # Check acquisition type. Prevent deletion if 'PURCHASED' or 'NYP'.
-        # Allow deletion if 'FREE'.
-        if library_item.acquisition_type == UserLibraryItem.ACQUISITION_CHOICES[0][0]: # 'FREE'
-            library_item.delete()
+        # Only FREE items may be removed. The check is part of the DELETE itself, so an item upgraded
+        # to PURCHASED by a concurrent order can't be deleted between a read and a write; no lock is taken.
+        deleted_count, _ = UserLibraryItem.objects.filter(
+            pk=pk, user=request.user, acquisition_type=ACQUISITION_FREE
+        ).delete()
+        if deleted_count:
+            UserLibraryItem.invalidate_list_cache(request.user.pk)
             return Response(status=status.HTTP_204_NO_CONTENT)
-        elif library_item.acquisition_type in [UserLibraryItem.ACQUISITION_CHOICES[1][0], UserLibraryItem.ACQUISITION_CHOICES[2][0]]: # 'PURCHASED' or 'NYP'
+
+        # Nothing deleted: say why.
+        library_item = get_object_or_404(UserLibraryItem.objects.only('acquisition_type'), pk=pk, user=request.user)
+        if library_item.acquisition_type in [ACQUISITION_PURCHASED, ACQUISITION_NYP]:
             return Response(
                 {'detail': 'Purchased items cannot be removed from your library.'}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -112,7 +209,7 @@ class LibraryViewSet(viewsets.GenericViewSet):
 
     @action(detail=True, methods=['post'], url_path='request-download') 
     def request_library_item_download(self, request, pk=None):
-        library_item = get_object_or_404(UserLibraryItem, pk=pk, user=request.user)
+        library_item = get_object_or_404(UserLibraryItem.objects.select_related('release'), pk=pk, user=request.user)
         release_to_download = library_item.release
 
         request_serializer = GeneratedDownloadRequestSerializer(data=request.data)
@@ -130,17 +227,11 @@ class LibraryViewSet(viewsets.GenericViewSet):
         ).first()
 
         if existing_ready_download:
+            existing_ready_download.release = release_to_download # Already loaded; the serializer reads its title
             status_serializer = GeneratedDownloadStatusSerializer(existing_ready_download, context={'request': request})
             return Response(status_serializer.data, status=status.HTTP_200_OK)
 
-        download_request_instance = GeneratedDownload.objects.create(
-            release=release_to_download,
-            user=request.user,
-            requested_format=requested_format,
-            status=GeneratedDownload.StatusChoices.PENDING
-        )
-
-        generate_release_download_zip.delay(download_request_instance.id)
+        download_request_instance = request_release_download_zip(release_to_download, request.user, requested_format)
 
         status_serializer = GeneratedDownloadStatusSerializer(download_request_instance, context={'request': request})
         return Response(status_serializer.data, status=status.HTTP_202_ACCEPTED)
\ No newline at end of file
@@ -1,12 +1,52 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
 from .models import Genre, Artist, Release, Track, Comment, Highlight, GeneratedDownload, ListenEvent 
+from .tasks import cleanup_eligible_downloads_q, cleanup_generated_download_files_task
+from django.urls import reverse
 from django.utils import timezone 
-from django.db import models 
+from django.utils.functional import cached_property
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
+from functools import lru_cache
 import logging 
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _admin_change_url_template(viewname):
+    # Change URLs only differ by object id, so the URLconf is resolved once per view rather than per row.
+    return reverse(viewname, args=[0]).replace('/0/', '/{}/')
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses Postgres' row estimate for an unfiltered changelist instead of COUNT(*) over the whole table.
+    Filtered or searched changelists, small tables and other databases are counted exactly.
+    """
+    exact_count_below = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] >= self.exact_count_below: # reltuples is -1 before the table's first ANALYZE
+                return row[0]
+        return super().count
+
+
+class NarrowChangeList(ChangeList):
+    """Loads only the ModelAdmin's `changelist_fields` for the listed rows; the change view still loads everything."""
+    def get_queryset(self, request):
+        return super().get_queryset(request).only(*self.model_admin.changelist_fields)
+
+
 @admin.register(Genre)
 class GenreAdmin(admin.ModelAdmin):
     list_display = ('name',)
@@ -15,6 +55,7 @@ class GenreAdmin(admin.ModelAdmin):
 @admin.register(Artist)
 class ArtistAdmin(admin.ModelAdmin):
     list_display = ('name', 'user', 'location')
+    list_select_related = ('user',)
     search_fields = ('name', 'user__username', 'location')
     fields = ('user', 'name', 'bio', 'artist_picture', 'location', 'website_url')
 
@@ -28,10 +69,15 @@ class TrackInline(admin.TabularInline):
 @admin.register(Release)
 class ReleaseAdmin(admin.ModelAdmin):
     list_display = ('title', 'artist', 'release_type', 'pricing_model', 'price', 'currency', 'release_date', 'is_published', 'is_visible', 'listen_count')
+    list_select_related = ('artist',)
     list_filter = ('release_type', 'is_published', 'artist', 'pricing_model', 'currency') 
-    search_fields = ('title', 'artist__name', 'genres__name') 
+    # Genres are matched by exact (case-insensitive) name: a substring match there would OR an ILIKE
+    # over the genres join into every search, for a short curated list people search by full name.
+    search_fields = ('title', 'artist__name', '=genres__name') 
     inlines = [TrackInline]
-    filter_horizontal = ('genres',) 
+    # list_display columns (is_visible reads is_published and release_date) plus what Release.__str__ reads.
+    changelist_fields = ('title', 'artist__name', 'artist_name_cached', 'release_type', 'pricing_model', 'price', 'currency', 'release_date', 'is_published', 'listen_count')
+    autocomplete_fields = ('genres',) # Matches are fetched on demand through GenreAdmin.search_fields
     readonly_fields = ('listen_count',) 
     fieldsets = (
         (None, {
@@ -47,14 +93,23 @@ class ReleaseAdmin(admin.ModelAdmin):
         form = super().get_form(request, obj, **kwargs)
         return form
 
+    def get_changelist(self, request, **kwargs):
+        return NarrowChangeList
+
 
 @admin.register(Track)
 class TrackAdmin(admin.ModelAdmin):
     list_display = ('title', 'release', 'track_number', 'duration_in_seconds', 'codec_name', 'is_lossless', 'listen_count') 
+    list_select_related = ('release',)
     list_filter = ('release__artist', 'is_lossless', 'codec_name', 'sample_rate') 
-    search_fields = ('title', 'release__title', 'release__artist__name', 'genres__name')
+    search_fields = ('title', 'release__title', 'release__artist__name', '=genres__name') # See ReleaseAdmin
     readonly_fields = ('duration_in_seconds', 'codec_name', 'bit_rate', 'sample_rate', 'channels', 'is_lossless', 'listen_count') 
-    filter_horizontal = ('genres',)
+    autocomplete_fields = ('genres',)
+    # audio_file is read by Track.__init__, so deferring it would cost a query per row.
+    changelist_fields = (
+        'title', 'audio_file', 'track_number', 'duration_in_seconds', 'codec_name', 'is_lossless', 'listen_count',
+        'release__title', 'release__release_type', 'release__artist_name_cached', 'release_title_cached', 'artist_name_cached',
+    )
     fieldsets = (
         (None, {
             'fields': ('release', 'title', 'track_number', 'audio_file', 'genres', 'listen_count') 
@@ -65,10 +120,14 @@ class TrackAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_changelist(self, request, **kwargs):
+        return NarrowChangeList
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('user', 'track', 'timestamp_seconds', 'created_at')
+    list_select_related = ('user', 'track')
     list_filter = ('created_at', 'user')
     search_fields = ('text', 'user__username', 'track__title')
 
@@ -85,6 +144,7 @@ class HighlightAdmin(admin.ModelAdmin):
         'created_at',
         'link_url_display' # Added link_url
     )
+    list_select_related = ('release', 'created_by')
     list_filter = ('is_active', 'created_by', 'release__artist')
     search_fields = (
         'release__title', 
@@ -131,7 +191,6 @@ class HighlightAdmin(admin.ModelAdmin):
 
     def link_url_display(self, obj):
         if obj.link_url:
-            from django.utils.html import format_html
             return format_html('<a href="{0}" target="_blank">{0}</a>', obj.link_url)
         return "N/A"
     link_url_display.short_description = "Link URL"
@@ -140,33 +199,23 @@ class HighlightAdmin(admin.ModelAdmin):
 @admin.register(GeneratedDownload)
 class GeneratedDownloadAdmin(admin.ModelAdmin):
     list_display = ('id', 'release', 'user', 'requested_format', 'status', 'celery_task_id', 'created_at', 'expires_at')
+    list_select_related = ('release', 'user')
     list_filter = ('status', 'requested_format', 'created_at', 'expires_at')
     search_fields = ('release__title', 'user__username', 'celery_task_id', 'unique_identifier')
     readonly_fields = ('id','unique_identifier', 'release', 'user', 'requested_format', 'celery_task_id', 'download_file', 'created_at', 'updated_at', 'expires_at', 'failure_reason')
     actions = ['cleanup_expired_files']
 
     def cleanup_expired_files(self, request, queryset):
-        count = 0
-        now = timezone.now()
-        items_to_cleanup = queryset.filter(
-            models.Q(status=GeneratedDownload.StatusChoices.FAILED) |
-            models.Q(status=GeneratedDownload.StatusChoices.EXPIRED) |
-            (models.Q(status=GeneratedDownload.StatusChoices.READY) & models.Q(expires_at__lt=now))
+        # Storage deletes happen in a Celery task, so large selections don't time out the admin request.
+        item_ids = list(
+            queryset.filter(cleanup_eligible_downloads_q(timezone.now()))
+            .exclude(download_file='').exclude(download_file__isnull=True)
+            .values_list('id', flat=True)
         )
-
-        for item in items_to_cleanup:
-            if item.download_file and item.download_file.name:
-                try:
-                    logger.info(f"Admin action: Attempting to delete file {item.download_file.name} for GeneratedDownload ID {item.id}")
-                    item.download_file.delete(save=False) 
-                    item.status = GeneratedDownload.StatusChoices.EXPIRED 
-                    item.failure_reason = (item.failure_reason or "") + "\nAdmin cleanup action."
-                    item.save(update_fields=['status', 'download_file', 'failure_reason'])
-                    count +=1
-                    logger.info(f"Admin action: Successfully deleted file and updated status for GeneratedDownload ID {item.id}")
-                except Exception as e:
-                    logger.error(f"Admin action: Failed to cleanup generated file for {item.id}: {e}")
-        self.message_user(request, f"Attempted cleanup for {items_to_cleanup.count()} items. Successfully cleaned up files for {count} items.")
+        if item_ids:
+            cleanup_generated_download_files_task.delay(item_ids)
+            logger.info(f"Admin action: Queued file cleanup for {len(item_ids)} GeneratedDownload items.")
+        self.message_user(request, f"Queued file cleanup for {len(item_ids)} items; they will be marked expired as their files are deleted.")
     cleanup_expired_files.short_description = "Cleanup selected failed/expired download files"
 
 @admin.register(ListenEvent)
@@ -180,7 +229,8 @@ class ListenEventAdmin(admin.ModelAdmin):
         'listened_at' 
     )
     list_filter = ('listened_at', 'track__release__artist', 'user') 
-    search_fields = ('track__title', 'release__title', 'user__username')
+    # Prefix matches only: UPPER(title) LIKE 'term%' can use the title trigram indexes on this high-volume changelist.
+    search_fields = ('^track__title', '^release__title', '^user__username')
     readonly_fields = (
         'user', 
         'track', 
@@ -189,22 +239,22 @@ class ListenEventAdmin(admin.ModelAdmin):
         'reported_listen_duration_ms', 
         'listened_at',
     )
-    list_select_related = ('user', 'track', 'release', 'track__release__artist')
+    list_select_related = ('user', 'track', 'release')
+    # Every significant listen adds a row, so avoid counting the table on each page load.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
+    # The links come from reverse() and an integer id, so only the titles need escaping.
     def track_title_link(self, obj):
-        from django.urls import reverse
-        from django.utils.html import format_html
-        link = reverse("admin:music_track_change", args=[obj.track.id])
-        return format_html('<a href="{}">{}</a>', link, obj.track.title)
+        link = _admin_change_url_template("admin:music_track_change").format(obj.track.id)
+        return mark_safe(f'<a href="{link}">{escape(obj.track.title)}</a>')
     track_title_link.short_description = 'Track'
     track_title_link.admin_order_field = 'track__title'
 
     def release_title_link(self, obj):
-        from django.urls import reverse
-        from django.utils.html import format_html
         if obj.release:
-            link = reverse("admin:music_release_change", args=[obj.release.id])
-            return format_html('<a href="{}">{}</a>', link, obj.release.title)
+            link = _admin_change_url_template("admin:music_release_change").format(obj.release.id)
+            return mark_safe(f'<a href="{link}">{escape(obj.release.title)}</a>')
         return '-'
     release_title_link.short_description = 'Release'
     release_title_link.admin_order_field = 'release__title'
@@ -0,0 +1,297 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:44
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import music.models
+import uuid
+import vaultwave.utils
+
+
+# Ported from 0005_seed_initial_genres.
+COMMON_GENRES = [
+    "Electronic", "Rock", "Pop", "Hip Hop", "Jazz", "Classical", "Blues", 
+    "Country", "Folk", "Reggae", "R&B", "Soul", "Metal", "Punk", 
+    "Alternative", "Indie", "Dance", "House", "Techno", "Trance",
+    "Ambient", "Soundtrack", "World Music", "Latin", "K-Pop", "J-Pop",
+    "Experimental", "Lo-fi", "Synthwave", "Funk", "Gospel", "Afrobeat"
+]
+
+def seed_genres(apps, schema_editor):
+    Genre = apps.get_model('music', 'Genre')
+    # Genre.name is unique, so genres that already exist are skipped by the database.
+    Genre.objects.bulk_create([Genre(name=genre_name) for genre_name in COMMON_GENRES], ignore_conflicts=True)
+
+def unseed_genres(apps, schema_editor):
+    Genre = apps.get_model('music', 'Genre')
+    Genre.objects.filter(name__in=COMMON_GENRES).delete()
+
+
+class Migration(migrations.Migration):
+
+    replaces = [('music', '0001_initial'), ('music', '0002_artist_location_artist_website_url'), ('music', '0003_remove_track_duration_seconds_and_more'), ('music', '0004_remove_release_genre_remove_track_genre_and_more'), ('music', '0005_seed_initial_genres'), ('music', '0006_alter_artist_artist_picture_alter_release_cover_art'), ('music', '0007_release_currency_release_download_file_and_more'), ('music', '0008_alter_release_download_file_generateddownload'), ('music', '0009_track_bit_rate_track_channels_track_codec_name_and_more'), ('music', '0010_alter_generateddownload_requested_format'), ('music', '0011_alter_track_audio_file'), ('music', '0012_release_listen_count_track_listen_count_listenevent'), ('music', '0013_remove_listenevent_music_liste_track_i_736251_idx_and_more'), ('music', '0014_remove_release_download_file_and_more'), ('music', '0015_alter_highlight_options_and_more'), ('music', '0016_remove_highlight_carousel_description_and_more')]
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Artist',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Artist or band name', max_length=200, unique=True)),
+                ('bio', models.TextField(blank=True, null=True)),
+                ('artist_picture', models.ImageField(blank=True, null=True, upload_to=music.models.artist_pic_path)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='artist_profile', to=settings.AUTH_USER_MODEL)),
+                ('location', models.CharField(blank=True, max_length=100, null=True)),
+                ('website_url', models.URLField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Release',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('release_type', models.CharField(choices=[('ALBUM', 'Album'), ('EP', 'EP'), ('SINGLE', 'Single')], default='ALBUM', max_length=10)),
+                ('release_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('cover_art', models.ImageField(blank=True, null=True, upload_to=music.models.cover_art_path)),
+                ('is_published', models.BooleanField(default=True, help_text='If unchecked, release is a draft.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('artist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='releases', to='music.artist')),
+                ('genres', models.ManyToManyField(blank=True, related_name='releases', to='music.genre')),
+            ],
+            options={
+                'ordering': ['-release_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Track',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('audio_file', models.FileField(upload_to=music.models.track_audio_path)),
+                ('track_number', models.PositiveIntegerField(blank=True, help_text='Order within the release', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('release', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tracks', to='music.release')),
+                ('duration_in_seconds', models.PositiveIntegerField(blank=True, help_text='Duration in seconds (auto-populated)', null=True)),
+                ('genres', models.ManyToManyField(blank=True, related_name='tracks', to='music.genre')),
+            ],
+            options={
+                'ordering': ['release', 'track_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Highlight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('highlighted_at', models.DateTimeField(auto_now_add=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('order', models.PositiveIntegerField(default=0, help_text='Optional ordering for highlights display')),
+                ('highlighted_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('release', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='highlights', to='music.release')),
+            ],
+            options={
+                'ordering': ['-highlighted_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('timestamp_seconds', models.PositiveIntegerField(blank=True, help_text='Optional: time in track comment refers to', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('track', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='music.track')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.RunPython(
+            code=seed_genres,
+            reverse_code=unseed_genres,
+        ),
+        migrations.AlterField(
+            model_name='artist',
+            name='artist_picture',
+            field=models.ImageField(blank=True, null=True, upload_to=music.models.artist_pic_path, validators=[vaultwave.utils.validate_image_not_gif_utility]),
+        ),
+        migrations.AlterField(
+            model_name='release',
+            name='cover_art',
+            field=models.ImageField(blank=True, null=True, upload_to=music.models.cover_art_path, validators=[vaultwave.utils.validate_image_not_gif_utility]),
+        ),
+        migrations.AddField(
+            model_name='release',
+            name='currency',
+            field=models.CharField(blank=True, choices=[('USD', 'US Dollar'), ('EUR', 'Euro'), ('GBP', 'British Pound')], default='USD', help_text="Currency for 'Paid' model.", max_length=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='release',
+            name='minimum_price_nyp',
+            field=models.DecimalField(blank=True, decimal_places=2, default=Decimal('0.00'), help_text="Minimum price for 'Name Your Price' model. Can be 0.", max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='release',
+            name='price',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text="Price for 'Paid' model. Leave blank if not 'Paid'.", max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='release',
+            name='pricing_model',
+            field=models.CharField(choices=[('FREE', 'Free'), ('PAID', 'Paid'), ('NYP', 'Name Your Price')], default='PAID', help_text='Choose the pricing model for downloads.', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='bit_rate',
+            field=models.PositiveIntegerField(blank=True, help_text='Bit rate in kbit/s (e.g., 320, 1411)', null=True),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='channels',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Number of audio channels (e.g., 1 for mono, 2 for stereo)', null=True),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='codec_name',
+            field=models.CharField(blank=True, help_text='Audio codec (e.g., mp3, flac, pcm_s16le)', max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='is_lossless',
+            field=models.BooleanField(blank=True, help_text='True if the original uploaded format is lossless', null=True),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='sample_rate',
+            field=models.PositiveIntegerField(blank=True, help_text='Sample rate in Hz (e.g., 44100, 48000)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='track',
+            name='audio_file',
+            field=models.FileField(max_length=255, upload_to=music.models.track_audio_path),
+        ),
+        migrations.AddField(
+            model_name='release',
+            name='listen_count',
+            field=models.PositiveIntegerField(default=0, help_text='Aggregated significant listens for this release.'),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='listen_count',
+            field=models.PositiveIntegerField(default=0, help_text='Aggregated significant listens for this track.'),
+        ),
+        migrations.CreateModel(
+            name='GeneratedDownload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('requested_format', models.CharField(choices=[('MP3_320', 'MP3 (320kbps)'), ('MP3_192', 'MP3 (192kbps)'), ('FLAC', 'FLAC (Lossless)'), ('WAV', 'WAV (Uncompressed Lossless)'), ('ORIGINAL_ZIP', 'Original Files')], max_length=20)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('READY', 'Ready'), ('FAILED', 'Failed'), ('EXPIRED', 'Expired')], default='PENDING', max_length=20)),
+                ('celery_task_id', models.CharField(blank=True, db_index=True, max_length=255, null=True)),
+                ('download_file', models.FileField(blank=True, help_text='The generated ZIP file for download.', null=True, upload_to=music.models.generated_release_download_path)),
+                ('unique_identifier', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique ID for download URL', unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('expires_at', models.DateTimeField(blank=True, help_text='When this download link/file expires.', null=True)),
+                ('failure_reason', models.TextField(blank=True, null=True)),
+                ('release', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='generated_downloads', to='music.release')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='generated_downloads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='music_gener_status_6f3c16_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ListenEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('listen_start_timestamp_utc', models.DateTimeField(help_text='UTC timestamp when this unmuted listening segment started.')),
+                ('reported_listen_duration_ms', models.PositiveIntegerField(help_text='Duration of this unmuted listening segment in milliseconds, reported by client.')),
+                ('listened_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when this event was logged by the backend.')),
+                ('release', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='listen_events', to='music.release')),
+                ('track', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listen_events', to='music.track')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listen_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-listened_at'],
+                'indexes': [models.Index(fields=['track', 'listened_at'], name='music_liste_track_i_d04903_idx'), models.Index(fields=['release', 'listened_at'], name='music_liste_release_eeb60c_idx'), models.Index(fields=['user', 'listened_at'], name='music_liste_user_id_2d5054_idx')],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='highlight',
+            options={'ordering': ['order', '-display_start_datetime', '-created_at']},
+        ),
+        migrations.RenameField(
+            model_name='highlight',
+            old_name='highlighted_at',
+            new_name='created_at',
+        ),
+        migrations.RemoveField(
+            model_name='highlight',
+            name='highlighted_by',
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='created_by',
+            field=models.ForeignKey(help_text='Admin/Staff user who created this highlight.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_highlights', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='custom_carousel_image',
+            field=models.ImageField(blank=True, help_text='Optional: Custom image for carousel. Defaults to release cover art.', null=True, upload_to=music.models.highlight_custom_image_path, validators=[vaultwave.utils.validate_image_not_gif_utility]),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='display_end_datetime',
+            field=models.DateTimeField(blank=True, help_text='Optional: When this highlight should stop being displayed. Leave blank for indefinite.', null=True),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='display_start_datetime',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When this highlight should start being displayed.'),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='highlight',
+            name='is_active',
+            field=models.BooleanField(default=True, help_text='Manually activate or deactivate this highlight.'),
+        ),
+        migrations.AlterField(
+            model_name='highlight',
+            name='order',
+            field=models.PositiveIntegerField(default=0, help_text='Order for display (e.g., 0 is first).'),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='description',
+            field=models.TextField(blank=True, help_text='Optional: Description for the highlight.'),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='subtitle',
+            field=models.CharField(blank=True, help_text='Optional: Subtitle for the highlight.', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='title',
+            field=models.CharField(blank=True, help_text='Optional: Highlight title. Defaults to release title.', max_length=200),
+        ),
+    ]
@@ -10,8 +10,8 @@ COMMON_GENRES = [
 
 def seed_genres(apps, schema_editor):
     Genre = apps.get_model('music', 'Genre')
-    for genre_name in COMMON_GENRES:
-        Genre.objects.get_or_create(name=genre_name)
+    # Genre.name is unique, so genres that already exist are skipped by the database.
+    Genre.objects.bulk_create([Genre(name=genre_name) for genre_name in COMMON_GENRES], ignore_conflicts=True)
 
 def unseed_genres(apps, schema_editor):
     Genre = apps.get_model('music', 'Genre')
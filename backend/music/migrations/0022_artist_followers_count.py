@@ -0,0 +1,31 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_followers_count(apps, schema_editor):
+    Artist = apps.get_model('music', 'Artist')
+    Follow = apps.get_model('interactions', 'Follow')
+    follower_counts = Follow.objects.filter(
+        artist=OuterRef('pk')
+    ).order_by().values('artist').annotate(total=Count('pk')).values('total')
+    Artist.objects.update(followers_count=Coalesce(Subquery(follower_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('music', '0021_highlight_link_url'),
+        ('interactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artist',
+            name='followers_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, help_text='Denormalized number of Follow rows, maintained by interactions.signals.'),
+        ),
+        migrations.RunPython(backfill_followers_count, reverse_code=migrations.RunPython.noop),
+    ]
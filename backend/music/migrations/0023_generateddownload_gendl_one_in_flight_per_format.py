@@ -0,0 +1,36 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:20
+
+from django.db import migrations, models
+
+
+def fail_duplicate_in_flight_downloads(apps, schema_editor):
+    # Keep the newest in-flight request per user/release/format; older duplicates could never finish usefully.
+    GeneratedDownload = apps.get_model('music', 'GeneratedDownload')
+    seen = set()
+    in_flight = GeneratedDownload.objects.filter(
+        status__in=['PENDING', 'PROCESSING']
+    ).order_by('-created_at').values_list('id', 'user_id', 'release_id', 'requested_format')
+    duplicate_ids = []
+    for download_id, user_id, release_id, requested_format in in_flight:
+        key = (user_id, release_id, requested_format)
+        if key in seen:
+            duplicate_ids.append(download_id)
+        seen.add(key)
+    GeneratedDownload.objects.filter(id__in=duplicate_ids).update(
+        status='FAILED', failure_reason='Duplicate of a newer request for the same format.'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('music', '0022_artist_followers_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_duplicate_in_flight_downloads, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='generateddownload',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['PENDING', 'PROCESSING'])), fields=('user', 'release', 'requested_format'), name='gendl_one_in_flight_per_format'),
+        ),
+    ]
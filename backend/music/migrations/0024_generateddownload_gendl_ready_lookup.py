@@ -0,0 +1,17 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('music', '0023_generateddownload_gendl_one_in_flight_per_format'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='generateddownload',
+            index=models.Index(fields=['user', 'release', 'requested_format', 'status', 'expires_at'], name='gendl_ready_lookup'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('music', '0025_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listenevent',
+            index=models.Index(fields=['-listened_at'], name='listen_listened_at_desc_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.21 on 2026-10-16 18:50
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_cached_names(apps, schema_editor):
+    Artist = apps.get_model('music', 'Artist')
+    Release = apps.get_model('music', 'Release')
+    Track = apps.get_model('music', 'Track')
+    Release.objects.update(
+        artist_name_cached=Subquery(Artist.objects.filter(pk=OuterRef('artist_id')).values('name')[:1])
+    )
+    releases = Release.objects.filter(pk=OuterRef('release_id'))
+    Track.objects.update(
+        release_title_cached=Subquery(releases.values('title')[:1]),
+        artist_name_cached=Subquery(releases.values('artist_name_cached')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('music', '0026_listenevent_listened_at_desc_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='release',
+            name='artist_name_cached',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Denormalized Artist.name, set on save and kept in sync by the Artist post_save receiver.', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='artist_name_cached',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='release_title_cached',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_cached_names, reverse_code=migrations.RunPython.noop),
+    ]
@@ -1,17 +1,17 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.conf import settings 
 from django.utils import timezone 
-from mutagen import File as MutagenFile 
-from mutagen import MutagenError
+import av
+from av.error import FFmpegError
 from django.core.exceptions import ValidationError 
 import os 
-from django.db.models.signals import pre_save, post_delete 
+from django.db.models.signals import pre_save, post_save, post_delete 
 from django.dispatch import receiver 
 import logging 
 from decimal import Decimal 
 import uuid 
-import subprocess 
-import json 
 
 from vaultwave.utils import (
     delete_file_if_changed,
@@ -24,6 +24,17 @@ from django.utils.translation import gettext_lazy as _
 
 logger = logging.getLogger(__name__) 
 
+AUDIO_METADATA_FIELDS = ('duration_in_seconds', 'codec_name', 'bit_rate', 'sample_rate', 'channels', 'is_lossless')
+
+def _foreign_key_may_change_on_save(instance, fk_name, loaded_id, update_fields):
+    """
+    Whether saving `instance` may write a `fk_name` value other than the stored one, i.e. whether the *_cached
+    copies of the related row must be re-read. Checks the in-memory instance only; a deferred key counts as unloaded.
+    """
+    if update_fields is not None:
+        return bool({fk_name, f'{fk_name}_id'} & set(update_fields))
+    return instance._state.adding or instance.__dict__.get(f'{fk_name}_id') != loaded_id
+
 def artist_pic_path(instance, filename):
     artist_id_for_path = instance.user.id if instance.user else "unknown_user"
     return f'artist_pics/{artist_id_for_path}/{filename}'
@@ -78,8 +89,17 @@ class Artist(models.Model):
     )
     location = models.CharField(max_length=100, blank=True, null=True)
     website_url = models.URLField(max_length=200, blank=True, null=True)
+    followers_count = models.PositiveIntegerField(
+        default=0, db_index=True, editable=False,
+        help_text="Denormalized number of Follow rows, maintained by interactions.signals."
+    )
     def __str__(self):
         return self.name
+    class Meta:
+        indexes = [
+            # Trigram index on UPPER(name): admin icontains search compiles to UPPER(name) LIKE '%...%'.
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='artist_name_trgm'),
+        ]
 
 class Release(models.Model):
     class ReleaseType(models.TextChoices):
@@ -136,11 +156,19 @@ class Release(models.Model):
     )
     
     listen_count = models.PositiveIntegerField(default=0, help_text="Aggregated significant listens for this release.")
+    artist_name_cached = models.CharField(
+        max_length=200, blank=True, default='', editable=False,
+        help_text="Denormalized Artist.name, set on save and kept in sync by the Artist post_save receiver."
+    )
 
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._artist_id_on_load = self.__dict__.get('artist_id') if self.pk else None
+
     def clean(self):
         super().clean()
         if self.pricing_model == self.PricingModel.PAID:
@@ -159,16 +187,33 @@ class Release(models.Model):
             self.price = None
         if self.pricing_model != self.PricingModel.NAME_YOUR_PRICE:
             self.minimum_price_nyp = None
-        
-        self.full_clean() 
+        # Only the pricing rules are enforced on every write; they are plain attribute checks. Field validators
+        # (e.g. the cover-art GIF check, which opens the image) run where input enters: the admin's ModelForm
+        # and ReleaseSerializer.
+        self.clean()
+        # Renames reach artist_name_cached through the Artist post_save receiver; the artist is only read here
+        # when this save may point the release at a different one.
+        if _foreign_key_may_change_on_save(self, 'artist', self._artist_id_on_load, kwargs.get('update_fields')):
+            self.artist_name_cached = self.artist.name
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'artist_name_cached'}
         super().save(*args, **kwargs)
+        self._artist_id_on_load = self.__dict__.get('artist_id')
 
     def is_visible(self):
         return self.is_published and self.release_date <= timezone.now()
+
+    @classmethod
+    def visible_q(cls, prefix=''):
+        """SQL counterpart of is_visible(); `prefix` is the lookup path to the release, e.g. 'release__'."""
+        return models.Q(**{f'{prefix}is_published': True, f'{prefix}release_date__lte': timezone.now()})
     def __str__(self):
-        return f"{self.title} ({self.get_release_type_display()}) by {self.artist.name}"
+        return f"{self.title} ({self.get_release_type_display()}) by {self.artist_name_cached}"
     class Meta:
         ordering = ['-release_date']
+        indexes = [
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='release_title_trgm'), # See Artist.Meta
+        ]
 
 class Track(models.Model):
     release = models.ForeignKey(Release, on_delete=models.CASCADE, related_name='tracks')
@@ -185,6 +230,10 @@ class Track(models.Model):
     is_lossless = models.BooleanField(null=True, blank=True, help_text="True if the original uploaded format is lossless")
     
     listen_count = models.PositiveIntegerField(default=0, help_text="Aggregated significant listens for this track.")
+    # Denormalized from the release so track listings need no release/artist JOIN for display names;
+    # set on save and kept in sync by the Artist and Release post_save receivers.
+    release_title_cached = models.CharField(max_length=255, blank=True, default='', editable=False)
+    artist_name_cached = models.CharField(max_length=200, blank=True, default='', editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     _original_audio_file_name_on_load = None
@@ -195,9 +244,10 @@ class Track(models.Model):
             self._original_audio_file_name_on_load = self.audio_file.name
         else:
             self._original_audio_file_name_on_load = None
+        self._release_id_on_load = self.__dict__.get('release_id') if self.pk else None
 
     def __str__(self):
-        return f"{self.title} (from {self.release.title} by {self.release.artist.name})"
+        return f"{self.title} (from {self.release_title_cached} by {self.artist_name_cached})"
 
     def extract_audio_metadata(self):
         if not self.audio_file or not self.audio_file.name:
@@ -209,80 +259,43 @@ class Track(models.Model):
             return False
         
         file_path = self.audio_file.path 
-        probe_data = {} 
-        audio_stream = None 
-
+        # libavformat is probed in-process: no ffprobe subprocess or JSON round-trip, and the duration comes
+        # from the same container header, so Mutagen is no longer needed as a second reader.
         try:
-            ffprobe_cmd = [
-                'ffprobe', '-v', 'error', '-print_format', 'json',
-                '-show_streams', '-show_format', file_path
-            ]
-            result = subprocess.run(ffprobe_cmd, capture_output=True, text=True, check=True)
-            probe_data = json.loads(result.stdout)
-
-            if 'streams' in probe_data:
-                for stream in probe_data['streams']:
-                    if stream.get('codec_type') == 'audio':
-                        audio_stream = stream
-                        break
-            
-            if audio_stream:
-                self.codec_name = audio_stream.get('codec_name')
-                br_str = audio_stream.get('bit_rate') or probe_data.get('format', {}).get('bit_rate')
-                if br_str: self.bit_rate = int(int(br_str) / 1000)
-                else: self.bit_rate = None
-                self.sample_rate = int(audio_stream.get('sample_rate', 0)) if audio_stream.get('sample_rate') else None
-                self.channels = audio_stream.get('channels')
-                
-                lossless_codecs = [
-                    'flac', 'pcm_s16le', 'pcm_s24le', 'pcm_s32le', 
-                    'pcm_f32le', 'pcm_f64le', 
-                    'alac', 'ape', 'wavpack', 'shorten', 'dsd', 'truehd', 'dts-hd' 
-                ]
-                self.is_lossless = self.codec_name in lossless_codecs if self.codec_name else None
-                logger.info(f"Track {self.id or self.title}: ffprobe - Codec: {self.codec_name}, Bitrate: {self.bit_rate}kbps, SampleRate: {self.sample_rate}Hz, Channels: {self.channels}, Lossless: {self.is_lossless}")
-            else:
-                logger.warning(f"Track {self.id or self.title}: No audio stream by ffprobe in {self.audio_file.name}.")
-                self.codec_name = None; self.bit_rate = None; self.sample_rate = None; self.channels = None; self.is_lossless = None;
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Track {self.id or self.title}: ffprobe error for {self.audio_file.name}: {e.stderr}")
-            self.codec_name = None; self.bit_rate = None; self.sample_rate = None; self.channels = None; self.is_lossless = None;
-        except FileNotFoundError:
-            logger.error(f"Track {self.id or self.title}: ffprobe not found.")
-            return False 
-        except json.JSONDecodeError:
-            logger.error(f"Track {self.id or self.title}: Failed to parse ffprobe JSON for {self.audio_file.name}.")
-        except Exception as e: 
-            logger.error(f"Track {self.id or self.title}: Unexpected ffprobe error for {self.audio_file.name}: {e}")
-
-
-        new_duration = None
-        try:
-            with self.audio_file.storage.open(self.audio_file.name, 'rb') as f:
-                audio_metadata_obj = MutagenFile(f)
-                if audio_metadata_obj and hasattr(audio_metadata_obj, 'info') and audio_metadata_obj.info and hasattr(audio_metadata_obj.info, 'length') and audio_metadata_obj.info.length > 0:
-                    new_duration = round(audio_metadata_obj.info.length)
-                    logger.info(f"Track {self.id or self.title}: Mutagen duration: {new_duration}s")
-                else: 
-                    if audio_stream and 'duration' in audio_stream:
-                        duration_str = audio_stream.get('duration')
-                        if duration_str: new_duration = round(float(duration_str))
-                        logger.info(f"Track {self.id or self.title}: ffprobe stream duration: {new_duration}s (mutagen failed/no length).")
-                    elif 'format' in probe_data and 'duration' in probe_data['format']:
-                        duration_str = probe_data['format'].get('duration')
-                        if duration_str: new_duration = round(float(duration_str))
-                        logger.info(f"Track {self.id or self.title}: ffprobe format duration: {new_duration}s (mutagen failed/no length).")
+            with av.open(file_path) as container:
+                audio_stream = next((stream for stream in container.streams if stream.type == 'audio'), None)
+                if audio_stream:
+                    codec_context = audio_stream.codec_context
+                    self.codec_name = codec_context.name
+                    br = audio_stream.bit_rate or container.bit_rate
+                    self.bit_rate = int(br / 1000) if br else None
+                    self.sample_rate = codec_context.sample_rate or None
+                    self.channels = len(codec_context.layout.channels) or None
+
+                    lossless_codecs = [
+                        'flac', 'pcm_s16le', 'pcm_s24le', 'pcm_s32le', 
+                        'pcm_f32le', 'pcm_f64le', 
+                        'alac', 'ape', 'wavpack', 'shorten', 'dsd', 'truehd', 'dts-hd' 
+                    ]
+                    self.is_lossless = self.codec_name in lossless_codecs if self.codec_name else None
+
+                    if audio_stream.duration and audio_stream.time_base:
+                        duration = float(audio_stream.duration * audio_stream.time_base)
+                    elif container.duration:
+                        duration = container.duration / av.time_base
                     else:
-                         logger.warning(f"Track {self.id or self.title}: Mutagen & ffprobe couldn't extract duration from {self.audio_file.name}.")
-        except MutagenError as e: 
-            logger.error(f"Track {self.id or self.title}: MutagenError reading duration for {self.audio_file.name}: {e}")
+                        duration = None
+                    self.duration_in_seconds = round(duration) if duration else None
+                    logger.info(f"Track {self.id or self.title}: libav - Codec: {self.codec_name}, Bitrate: {self.bit_rate}kbps, SampleRate: {self.sample_rate}Hz, Channels: {self.channels}, Lossless: {self.is_lossless}, Duration: {self.duration_in_seconds}s")
+                else:
+                    logger.warning(f"Track {self.id or self.title}: No audio stream found by libav in {self.audio_file.name}.")
+                    self.codec_name = None; self.bit_rate = None; self.sample_rate = None; self.channels = None; self.is_lossless = None; self.duration_in_seconds = None
+        except FFmpegError as e:
+            logger.error(f"Track {self.id or self.title}: libav error probing {self.audio_file.name}: {e}")
+            self.codec_name = None; self.bit_rate = None; self.sample_rate = None; self.channels = None; self.is_lossless = None; self.duration_in_seconds = None
         except Exception as e: 
-            logger.error(f"Track {self.id or self.title}: Error reading for duration with Mutagen/ffprobe fallback for {self.audio_file.name}: {e}")
-
+            logger.error(f"Track {self.id or self.title}: Unexpected error probing {self.audio_file.name}: {e}")
 
-        if self.duration_in_seconds != new_duration:
-            self.duration_in_seconds = new_duration
-            return True 
         return True 
 
     def save(self, *args, **kwargs):
@@ -297,57 +310,38 @@ class Track(models.Model):
         elif not current_audio_file_name and self._original_audio_file_name_on_load: 
             file_changed = True 
 
-        if file_changed and not current_audio_file_name: 
-            self.duration_in_seconds = None; self.codec_name = None; self.bit_rate = None
-            self.sample_rate = None; self.channels = None; self.is_lossless = None
-            logger.info(f"Track PK '{self.pk}': File cleared, metadata reset.")
-            super().save(*args, **kwargs) 
-            self._original_audio_file_name_on_load = None 
-            logger.info(f"Track.save() finished early for cleared file on track PK '{self.pk}'.")
-            return
-        
-        if not is_new_instance and not file_changed:
-             super().save(*args, **kwargs)
-        else: 
-            super().save(*args, **kwargs) 
-
+        # See Release.save; release edits reach these through the Release post_save receiver.
+        if _foreign_key_may_change_on_save(self, 'release', self._release_id_on_load, kwargs.get('update_fields')):
+            self.release_title_cached = self.release.title
+            self.artist_name_cached = self.release.artist_name_cached
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'release_title_cached', 'artist_name_cached'}
+
+        if file_changed:
+            # The previous file's metadata no longer applies; a new file is probed by a worker once this save commits,
+            # so the upload request only pays for the file write and one INSERT/UPDATE.
+            for field_name in AUDIO_METADATA_FIELDS:
+                setattr(self, field_name, None)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], *AUDIO_METADATA_FIELDS}
+            logger.info(f"Track PK '{self.pk}': File changed, metadata reset.")
 
+        super().save(*args, **kwargs)
         self._original_audio_file_name_on_load = self.audio_file.name if self.audio_file else None
+        self._release_id_on_load = self.__dict__.get('release_id')
 
-        metadata_fields_to_update = []
-        
-        if file_changed and self.audio_file and self.audio_file.name:
-            logger.info(f"Track PK '{self.pk}': File changed to '{self.audio_file.name}'. Extracting metadata.")
-            
-            old_metadata = {
-                'duration_in_seconds': self.duration_in_seconds, 'codec_name': self.codec_name,
-                'bit_rate': self.bit_rate, 'sample_rate': self.sample_rate,
-                'channels': self.channels, 'is_lossless': self.is_lossless
-            }
-            self.extract_audio_metadata() 
-
-            for field_name, old_value in old_metadata.items():
-                if getattr(self, field_name) != old_value:
-                    metadata_fields_to_update.append(field_name)
-            
-            if metadata_fields_to_update:
-                logger.info(f"Track PK '{self.pk}': Metadata changed. Fields: {metadata_fields_to_update}. Saving metadata.")
-            else:
-                logger.info(f"Track PK '{self.pk}': Metadata extracted but no changes detected to metadata fields.")
-
-        elif is_new_instance and self.audio_file and self.audio_file.name and self.codec_name is None: 
-            logger.info(f"Track PK '{self.pk}': New instance, metadata not yet set. Extracting and saving metadata.")
-            self.extract_audio_metadata() 
-            metadata_fields_to_update = ['duration_in_seconds', 'codec_name', 'bit_rate', 'sample_rate', 'channels', 'is_lossless']
-            
-        if metadata_fields_to_update:
-            super().save(update_fields=metadata_fields_to_update)
-            
+        if file_changed and current_audio_file_name:
+            from .tasks import extract_track_metadata_task
+            track_id, audio_file_name = self.pk, self.audio_file.name
+            transaction.on_commit(lambda: extract_track_metadata_task.delay(track_id, audio_file_name))
         logger.info(f"Track.save() finished for track PK '{self.pk}'.")
 
 
     class Meta:
             ordering = ['release', 'track_number']
+            indexes = [
+                GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='track_title_trgm'), # See Artist.Meta
+            ]
 
 
 class Comment(models.Model):
@@ -469,6 +463,8 @@ class GeneratedDownload(models.Model):
         FLAC = 'FLAC', 'FLAC (Lossless)'
         WAV = 'WAV', 'WAV (Uncompressed Lossless)' 
         ORIGINAL_ZIP = 'ORIGINAL_ZIP', 'Original Files'
+
+    IN_FLIGHT_STATUSES = [StatusChoices.PENDING, StatusChoices.PROCESSING]
     
     release = models.ForeignKey(Release, on_delete=models.CASCADE, related_name='generated_downloads')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='generated_downloads')
@@ -497,6 +493,16 @@ class GeneratedDownload(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status', 'expires_at']),
+            # Equality columns first, expires_at last for the range check: finds a user's unexpired READY download.
+            models.Index(fields=['user', 'release', 'requested_format', 'status', 'expires_at'], name='gendl_ready_lookup'),
+        ]
+        constraints = [
+            # One ZIP build at a time per user/release/format; READY rows are excluded because they expire.
+            models.UniqueConstraint(
+                fields=['user', 'release', 'requested_format'],
+                condition=models.Q(status__in=['PENDING', 'PROCESSING']),
+                name='gendl_one_in_flight_per_format'
+            ),
         ]
 
 class ListenEvent(models.Model):
@@ -536,6 +542,9 @@ class ListenEvent(models.Model):
             models.Index(fields=['track', 'listened_at']),
             models.Index(fields=['release', 'listened_at']),
             models.Index(fields=['user', 'listened_at']),
+            # Newest-first scans for the default ordering and the admin's listened_at filter; the composites
+            # above are scanned backwards for per-track/release/user listings.
+            models.Index(fields=['-listened_at'], name='listen_listened_at_desc_idx'),
         ]
 
     def __str__(self):
@@ -568,6 +577,23 @@ def highlight_pre_save_delete_old_custom_image(sender, instance, **kwargs):
     delete_file_if_changed(sender, instance, 'custom_carousel_image')
 
 
+# Denormalized names: rows already holding the current values are excluded, so saves that rename nothing write nothing.
+@receiver(post_save, sender=Artist)
+def artist_post_save_sync_cached_names(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    Release.objects.filter(artist=instance).exclude(artist_name_cached=instance.name).update(artist_name_cached=instance.name)
+    Track.objects.filter(release__artist=instance).exclude(artist_name_cached=instance.name).update(artist_name_cached=instance.name)
+
+@receiver(post_save, sender=Release)
+def release_post_save_sync_cached_names(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not {'title', 'artist'} & set(update_fields)):
+        return
+    Track.objects.filter(release=instance).exclude(
+        release_title_cached=instance.title, artist_name_cached=instance.artist_name_cached
+    ).update(release_title_cached=instance.title, artist_name_cached=instance.artist_name_cached)
+
+
 @receiver(post_delete, sender=Artist)
 def artist_post_delete_cleanup_picture(sender, instance, **kwargs):
     delete_file_on_instance_delete(instance.artist_picture)
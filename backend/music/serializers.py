@@ -5,6 +5,7 @@ from decimal import Decimal
 from django.utils.dateparse import parse_datetime 
 from django.utils.translation import gettext_lazy as _ 
 from rest_framework.validators import UniqueValidator 
+from vaultwave.utils import CachedFieldsSerializerMixin
 
 class ListenSegmentLogSerializer(serializers.Serializer):
     segment_start_timestamp_utc = serializers.DateTimeField(
@@ -32,15 +33,15 @@ class ArtistSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Artist
-        fields = ['id', 'user', 'user_id', 'name', 'bio', 'artist_picture', 'location', 'website_url']
+        fields = ['id', 'user', 'user_id', 'name', 'bio', 'artist_picture', 'location', 'website_url', 'followers_count']
 
 
-class TrackSerializer(serializers.ModelSerializer):
-    release_title = serializers.CharField(source='release.title', read_only=True)
-    artist_name = serializers.CharField(source='release.artist.name', read_only=True)
+class TrackSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    release_title = serializers.CharField(source='release_title_cached', read_only=True)
+    artist_name = serializers.CharField(source='artist_name_cached', read_only=True)
     release_cover_art = serializers.ImageField(source='release.cover_art', read_only=True, allow_null=True)
     release_id = serializers.IntegerField(source='release.id', read_only=True)
-    artist_id = serializers.IntegerField(source='release.artist.id', read_only=True)
+    artist_id = serializers.IntegerField(source='release.artist_id', read_only=True)
     genres_data = GenreSerializer(source='genres', many=True, read_only=True) 
     genre_names = serializers.ListField(
         child=serializers.CharField(max_length=100, allow_blank=False),
@@ -116,7 +117,7 @@ class TrackSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ReleaseSerializer(serializers.ModelSerializer):
+class ReleaseSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     artist = ArtistSerializer(read_only=True)
     artist_id = serializers.PrimaryKeyRelatedField(
         queryset=Artist.objects.all(), source='artist', write_only=True, required=False 
@@ -164,53 +165,8 @@ class ReleaseSerializer(serializers.ModelSerializer):
         ]
 
     def get_available_download_formats(self, obj: Release):
-        formats = []
         serialized_tracks = self.fields['tracks'].to_representation(obj.tracks.all()) if hasattr(obj.tracks, 'all') else obj.tracks
-
-        if not serialized_tracks: return []
-
-        all_tracks_are_lossless_uploads = True
-        for track_data in serialized_tracks:
-            if track_data.get('is_lossless') is False or track_data.get('is_lossless') is None:
-                all_tracks_are_lossless_uploads = False
-                break
-        
-        all_mp3_original = True
-        for track_data in serialized_tracks:
-            if track_data.get('codec_name') != 'mp3': 
-                all_mp3_original = False
-                break
-
-        formats.append({'value': GeneratedDownload.DownloadFormatChoices.ORIGINAL_ZIP.value, 'label': GeneratedDownload.DownloadFormatChoices.ORIGINAL_ZIP.label})
-        
-        can_offer_mp3_320 = True 
-        if can_offer_mp3_320:
-            formats.append({'value': GeneratedDownload.DownloadFormatChoices.MP3_320.value, 'label': GeneratedDownload.DownloadFormatChoices.MP3_320.label})
-        formats.append({'value': GeneratedDownload.DownloadFormatChoices.MP3_192.value, 'label': GeneratedDownload.DownloadFormatChoices.MP3_192.label})
-        
-        if all_tracks_are_lossless_uploads:
-            formats.append({'value': GeneratedDownload.DownloadFormatChoices.FLAC.value, 'label': GeneratedDownload.DownloadFormatChoices.FLAC.label})
-            formats.append({'value': GeneratedDownload.DownloadFormatChoices.WAV.value, 'label': GeneratedDownload.DownloadFormatChoices.WAV.label})
-        
-        final_formats = []
-        seen_values = set()
-        preferred_order = [
-            GeneratedDownload.DownloadFormatChoices.ORIGINAL_ZIP.value,
-            GeneratedDownload.DownloadFormatChoices.FLAC.value,
-            GeneratedDownload.DownloadFormatChoices.WAV.value,
-            GeneratedDownload.DownloadFormatChoices.MP3_320.value,
-            GeneratedDownload.DownloadFormatChoices.MP3_192.value,
-        ]
-        for p_val in preferred_order:
-            for fmt in formats:
-                if fmt['value'] == p_val and p_val not in seen_values:
-                    final_formats.append(fmt)
-                    seen_values.add(p_val)
-        for fmt in formats:
-            if fmt['value'] not in seen_values:
-                 final_formats.append(fmt)
-                 seen_values.add(p_val)
-        return final_formats
+        return available_download_formats(serialized_tracks)
 
     def validate(self, data):
         pricing_model = data.get('pricing_model', getattr(self.instance, 'pricing_model', None))
@@ -291,6 +247,58 @@ class ReleaseSerializer(serializers.ModelSerializer):
         return instance
 
 
+def available_download_formats(serialized_tracks):
+    """
+    Download formats offered for a release, given its serialized tracks
+    (only their 'is_lossless' and 'codec_name' keys are read).
+    """
+    formats = []
+    if not serialized_tracks: return []
+
+    all_tracks_are_lossless_uploads = True
+    for track_data in serialized_tracks:
+        if track_data.get('is_lossless') is False or track_data.get('is_lossless') is None:
+            all_tracks_are_lossless_uploads = False
+            break
+    
+    all_mp3_original = True
+    for track_data in serialized_tracks:
+        if track_data.get('codec_name') != 'mp3': 
+            all_mp3_original = False
+            break
+
+    formats.append({'value': GeneratedDownload.DownloadFormatChoices.ORIGINAL_ZIP.value, 'label': GeneratedDownload.DownloadFormatChoices.ORIGINAL_ZIP.label})
+    
+    can_offer_mp3_320 = True 
+    if can_offer_mp3_320:
+        formats.append({'value': GeneratedDownload.DownloadFormatChoices.MP3_320.value, 'label': GeneratedDownload.DownloadFormatChoices.MP3_320.label})
+    formats.append({'value': GeneratedDownload.DownloadFormatChoices.MP3_192.value, 'label': GeneratedDownload.DownloadFormatChoices.MP3_192.label})
+    
+    if all_tracks_are_lossless_uploads:
+        formats.append({'value': GeneratedDownload.DownloadFormatChoices.FLAC.value, 'label': GeneratedDownload.DownloadFormatChoices.FLAC.label})
+        formats.append({'value': GeneratedDownload.DownloadFormatChoices.WAV.value, 'label': GeneratedDownload.DownloadFormatChoices.WAV.label})
+    
+    final_formats = []
+    seen_values = set()
+    preferred_order = [
+        GeneratedDownload.DownloadFormatChoices.ORIGINAL_ZIP.value,
+        GeneratedDownload.DownloadFormatChoices.FLAC.value,
+        GeneratedDownload.DownloadFormatChoices.WAV.value,
+        GeneratedDownload.DownloadFormatChoices.MP3_320.value,
+        GeneratedDownload.DownloadFormatChoices.MP3_192.value,
+    ]
+    for p_val in preferred_order:
+        for fmt in formats:
+            if fmt['value'] == p_val and p_val not in seen_values:
+                final_formats.append(fmt)
+                seen_values.add(p_val)
+    for fmt in formats:
+        if fmt['value'] not in seen_values:
+             final_formats.append(fmt)
+             seen_values.add(p_val)
+    return final_formats
+
+
 class CommentSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField() 
 
@@ -401,7 +409,7 @@ class HighlightSerializer(serializers.ModelSerializer):
 class GeneratedDownloadRequestSerializer(serializers.Serializer):
     requested_format = serializers.ChoiceField(choices=GeneratedDownload.DownloadFormatChoices.choices)
 
-class GeneratedDownloadStatusSerializer(serializers.ModelSerializer):
+class GeneratedDownloadStatusSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     release_title = serializers.CharField(source='release.title', read_only=True)
     download_url = serializers.SerializerMethodField()
     requested_format_display = serializers.CharField(source='get_requested_format_display', read_only=True)
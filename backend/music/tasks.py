@@ -4,7 +4,9 @@ from django.core.files.base import ContentFile
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime 
 from django.contrib.auth import get_user_model
-from django.db.models import F
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Concat
 from django.db.models import Q 
 from pydub import AudioSegment
 from pydub.exceptions import CouldntDecodeError
@@ -13,9 +15,12 @@ import os
 import tempfile
 import logging
 import shutil 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta 
+from itertools import islice
 
-from .models import Release, GeneratedDownload, Track, ListenEvent 
+from library.models import UserLibraryItem
+from .models import AUDIO_METADATA_FIELDS, Release, GeneratedDownload, Track, ListenEvent 
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -26,8 +31,17 @@ User = get_user_model()
 # Set to 0 if you want no debouncing beyond the duration significance itself for a user.
 SIGNIFICANT_LISTEN_DEBOUNCE_FACTOR = 1.0 
 
+# In-flight download requests with no progress for this long are treated as abandoned by their worker.
+STALE_DOWNLOAD_REQUEST_AFTER = timedelta(minutes=30)
 
-@shared_task(bind=True)
+# Download-file cleanup streams rows in chunks of this size; the admin-requested cleanup also deletes each
+# chunk's files concurrently (storage calls are I/O bound) before one UPDATE for the chunk.
+CLEANUP_FILES_CHUNK_SIZE = 500
+CLEANUP_FILES_MAX_WORKERS = 16
+
+
+# Progress and outcome are tracked on GeneratedDownload, so the Celery result is never stored.
+@shared_task(bind=True, ignore_result=True)
 def generate_release_download_zip(self, generated_download_id):
     try:
         download_request = GeneratedDownload.objects.select_related('release__artist').get(id=generated_download_id)
@@ -190,21 +204,66 @@ def generate_release_download_zip(self, generated_download_id):
             logger.error(f"Additionally, failed to update download_request status to FAILED: {e_save}")
         raise
 
+def _create_pending_download(release, user, requested_format):
+    # Savepoint, so a unique-constraint conflict leaves any outer transaction usable.
+    with transaction.atomic():
+        return GeneratedDownload.objects.create(
+            release=release,
+            user=user,
+            requested_format=requested_format,
+            status=GeneratedDownload.StatusChoices.PENDING
+        )
+
+def request_release_download_zip(release, user, requested_format):
+    """
+    Creates a PENDING GeneratedDownload and enqueues its ZIP task.
+    The database allows one in-flight request per user/release/format, so repeats
+    (double clicks, client retries) get that request back instead of queueing another ZIP build.
+    """
+    in_flight_requests = GeneratedDownload.objects.filter(
+        user=user, release=release, requested_format=requested_format,
+        status__in=GeneratedDownload.IN_FLIGHT_STATUSES
+    )
+    try:
+        download_request = _create_pending_download(release, user, requested_format)
+    except IntegrityError:
+        in_flight = in_flight_requests.first()
+        if in_flight and in_flight.updated_at >= timezone.now() - STALE_DOWNLOAD_REQUEST_AFTER:
+            in_flight.release = release # Already loaded by the caller; status serializers read its title
+            return in_flight
+        if in_flight:
+            # The worker building it died without recording a result; retire it so a new request can be queued.
+            in_flight_requests.filter(pk=in_flight.pk).update(
+                status=GeneratedDownload.StatusChoices.FAILED,
+                failure_reason="Stopped making progress; superseded by a new request.",
+                updated_at=timezone.now()
+            )
+        try:
+            download_request = _create_pending_download(release, user, requested_format)
+        except IntegrityError:
+            # A concurrent request queued one first; hand that one back.
+            in_flight = in_flight_requests.get()
+            in_flight.release = release
+            return in_flight
+
+    # Enqueue only once the PENDING row is committed, so a rolled-back request never reaches a worker.
+    transaction.on_commit(lambda: generate_release_download_zip.delay(download_request.id))
+    return download_request
+
 @shared_task(name="cleanup_generated_downloads")
 def cleanup_generated_downloads_task():
     now = timezone.now()
-    items_to_cleanup = GeneratedDownload.objects.filter(
-        Q(status=GeneratedDownload.StatusChoices.FAILED) |
-        Q(status=GeneratedDownload.StatusChoices.EXPIRED) |
-        (Q(status=GeneratedDownload.StatusChoices.READY) & Q(expires_at__lt=now))
-    )
+    # Only the columns the loop reads or writes; rows are streamed rather than cached.
+    items_to_cleanup = GeneratedDownload.objects.filter(cleanup_eligible_downloads_q(now))\
+        .only('id', 'status', 'download_file', 'failure_reason')\
+        .iterator(chunk_size=CLEANUP_FILES_CHUNK_SIZE)
 
+    count_scanned = 0
     count_cleaned = 0
     count_failed_to_clean = 0
 
-    logger.info(f"[Celery Task] Found {items_to_cleanup.count()} GeneratedDownload items for cleanup.")
-
     for item in items_to_cleanup:
+        count_scanned += 1
         original_status = item.status
         file_deleted_successfully = False
         if item.download_file and item.download_file.name:
@@ -234,10 +293,78 @@ def cleanup_generated_downloads_task():
             logger.error(f"[Celery Task] Failed to update status for GeneratedDownload ID {item.id} after cleanup attempt: {e_save}")
             count_failed_to_clean +=1
     
-    logger.info(f"[Celery Task] Cleanup finished. Cleaned records: {count_cleaned}. Failed to update records: {count_failed_to_clean}.")
+    logger.info(f"[Celery Task] Cleanup finished. Found {count_scanned} items. Cleaned records: {count_cleaned}. Failed to update records: {count_failed_to_clean}.")
     return f"Cleaned {count_cleaned} items. Failed to update {count_failed_to_clean} items."
 
 
+def cleanup_eligible_downloads_q(now):
+    """GeneratedDownloads whose files may be removed: failed, expired, or READY past their expiry."""
+    return (
+        Q(status=GeneratedDownload.StatusChoices.FAILED) |
+        Q(status=GeneratedDownload.StatusChoices.EXPIRED) |
+        (Q(status=GeneratedDownload.StatusChoices.READY) & Q(expires_at__lt=now))
+    )
+
+def _delete_download_file(item):
+    try:
+        item.download_file.delete(save=False)
+        return True
+    except Exception as e:
+        logger.error(f"[Celery Task] Failed to delete file for GeneratedDownload ID {item.id}: {e}")
+        return False
+
+@shared_task(name="music.cleanup_generated_download_files", ignore_result=True)
+def cleanup_generated_download_files_task(generated_download_ids):
+    """
+    Deletes the files of the given downloads (as selected in the admin) and marks them EXPIRED.
+    Rows that are no longer eligible or have no file are skipped; rows whose file could not be
+    deleted are left unchanged, as the admin action did.
+    """
+    items = GeneratedDownload.objects.filter(
+        cleanup_eligible_downloads_q(timezone.now()), id__in=generated_download_ids
+    ).exclude(download_file='').exclude(download_file__isnull=True)\
+        .only('id', 'download_file')\
+        .iterator(chunk_size=CLEANUP_FILES_CHUNK_SIZE)
+
+    count_cleaned = 0
+    with ThreadPoolExecutor(max_workers=CLEANUP_FILES_MAX_WORKERS) as executor:
+        while chunk := list(islice(items, CLEANUP_FILES_CHUNK_SIZE)):
+            cleaned_ids = [item.id for item, deleted in zip(chunk, executor.map(_delete_download_file, chunk)) if deleted]
+            if cleaned_ids:
+                GeneratedDownload.objects.filter(id__in=cleaned_ids).update(
+                    status=GeneratedDownload.StatusChoices.EXPIRED,
+                    download_file='',
+                    failure_reason=Concat(Coalesce('failure_reason', Value('')), Value("\nAdmin cleanup action.")),
+                )
+            count_cleaned += len(cleaned_ids)
+
+    logger.info(f"[Celery Task] Admin file cleanup finished. Cleaned {count_cleaned} of {len(generated_download_ids)} selected items.")
+
+
+@shared_task(name="music.extract_track_metadata", ignore_result=True)
+def extract_track_metadata_task(track_id, audio_file_name):
+    """
+    Fills in a track's audio metadata after its file was saved. The row is only updated while it still
+    points at the probed file, so a replacement uploaded in the meantime is left to its own task.
+    """
+    try:
+        track = Track.objects.get(pk=track_id)
+    except Track.DoesNotExist:
+        logger.info(f"[Celery Task] Track ID {track_id} no longer exists; skipping metadata extraction.")
+        return
+    if track.audio_file.name != audio_file_name:
+        logger.info(f"[Celery Task] Track ID {track_id} file changed since it was queued; skipping metadata extraction.")
+        return
+
+    if track.extract_audio_metadata():
+        updated = Track.objects.filter(pk=track_id, audio_file=audio_file_name).update(
+            **{field_name: getattr(track, field_name) for field_name in AUDIO_METADATA_FIELDS}
+        )
+        if updated:
+            # Library lists show duration, codec and losslessness; the update above sends no post_save.
+            UserLibraryItem.invalidate_list_caches_of_holders(release_id=track.release_id)
+
+
 @shared_task(name="music.process_listen_segment")
 def process_listen_segment_task(user_id, track_id, segment_start_timestamp_utc_iso, segment_duration_ms):
     logger.info(f"Celery Task: Processing listen segment for track_id={track_id}, user_id={user_id}, start={segment_start_timestamp_utc_iso}, duration_ms={segment_duration_ms}")
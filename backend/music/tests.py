@@ -2,10 +2,15 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 import os 
 import shutil 
+from datetime import timedelta
+from unittest import mock
 from django.contrib.auth.models import User 
-from .models import Artist, Release, Track, Genre 
+from .models import Artist, Release, Track, Genre, GeneratedDownload
+from . import tasks
 from itertools import islice
 
 TEST_MEDIA_ROOT = os.path.join(settings.BASE_DIR, 'test_media_music_tests') 
@@ -167,4 +172,80 @@ class StreamTrackAudioViewTests(TestCase):
             self.assertTrue('Content-Range' in response, "Content-Range header missing for 416 response")
             self.assertEqual(response.get('Content-Range'), f'bytes */{self.audio_file_size}')
         elif response.status_code == 200: 
-            self.assertEqual(int(response.get('Content-Length')), self.audio_file_size)
\ No newline at end of file
+            self.assertEqual(int(response.get('Content-Length')), self.audio_file_size)
+
+class RequestReleaseDownloadZipTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testdownloaduser', password='testpassword')
+        cls.artist = Artist.objects.create(user=cls.user, name='Test Download Artist')
+        cls.release = Release.objects.create(artist=cls.artist, title='Test Download Album', pricing_model='FREE')
+
+    def request_download(self, requested_format=GeneratedDownload.DownloadFormatChoices.FLAC):
+        with mock.patch.object(tasks.generate_release_download_zip, 'delay') as delay, \
+                self.captureOnCommitCallbacks(execute=True):
+            download_request = tasks.request_release_download_zip(self.release, self.user, requested_format)
+        return download_request, delay
+
+    def test_repeat_request_reuses_in_flight_download(self):
+        first, delay = self.request_download()
+        self.assertEqual(first.status, GeneratedDownload.StatusChoices.PENDING)
+        delay.assert_called_once_with(first.id)
+
+        second, delay = self.request_download()
+        self.assertEqual(second.pk, first.pk)
+        delay.assert_not_called()
+        self.assertEqual(GeneratedDownload.objects.count(), 1)
+
+    def test_other_format_or_ready_download_does_not_block(self):
+        first, _ = self.request_download()
+        other_format, delay = self.request_download(GeneratedDownload.DownloadFormatChoices.MP3_320)
+        self.assertNotEqual(other_format.pk, first.pk)
+        delay.assert_called_once_with(other_format.id)
+
+        GeneratedDownload.objects.filter(pk=first.pk).update(status=GeneratedDownload.StatusChoices.READY)
+        after_ready, delay = self.request_download()
+        self.assertNotEqual(after_ready.pk, first.pk)
+        delay.assert_called_once_with(after_ready.id)
+
+    def test_database_allows_one_in_flight_download(self):
+        GeneratedDownload.objects.create(
+            release=self.release, user=self.user, requested_format=GeneratedDownload.DownloadFormatChoices.FLAC
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            GeneratedDownload.objects.create(
+                release=self.release, user=self.user, requested_format=GeneratedDownload.DownloadFormatChoices.FLAC,
+                status=GeneratedDownload.StatusChoices.PROCESSING
+            )
+
+    def test_stale_in_flight_download_is_retired(self):
+        stale, _ = self.request_download()
+        GeneratedDownload.objects.filter(pk=stale.pk).update(
+            updated_at=timezone.now() - tasks.STALE_DOWNLOAD_REQUEST_AFTER - timedelta(minutes=1)
+        )
+
+        replacement, delay = self.request_download()
+        self.assertNotEqual(replacement.pk, stale.pk)
+        delay.assert_called_once_with(replacement.id)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, GeneratedDownload.StatusChoices.FAILED)
+
+    def test_stale_retry_returns_concurrently_queued_download(self):
+        stale, _ = self.request_download()
+        GeneratedDownload.objects.filter(pk=stale.pk).update(
+            updated_at=timezone.now() - tasks.STALE_DOWNLOAD_REQUEST_AFTER - timedelta(minutes=1)
+        )
+        create_pending_download = tasks._create_pending_download
+        concurrent = []
+
+        def create_after_concurrent_request(*args):
+            stale_retired = GeneratedDownload.objects.filter(pk=stale.pk, status=GeneratedDownload.StatusChoices.FAILED).exists()
+            if stale_retired and not concurrent:
+                # Another request retires the stale row and queues its own download first.
+                concurrent.append(create_pending_download(*args))
+            return create_pending_download(*args)
+
+        with mock.patch.object(tasks, '_create_pending_download', side_effect=create_after_concurrent_request):
+            download_request, delay = self.request_download()
+        self.assertEqual(download_request.pk, concurrent[0].pk)
+        delay.assert_not_called()
@@ -25,7 +25,7 @@ from rest_framework.decorators import action, api_view, permission_classes as dr
 from rest_framework.permissions import IsAuthenticated as DRFIsAuthenticated 
 import logging
 
-from .tasks import generate_release_download_zip, process_listen_segment_task 
+from .tasks import request_release_download_zip, process_listen_segment_task 
 
 logger = logging.getLogger(__name__)
 
@@ -79,7 +79,7 @@ class ReleaseViewSet(viewsets.ModelViewSet):
             'genres', prefetch_tracks_with_genres 
         )
 
-        visible_to_all_q = django_models.Q(is_published=True, release_date__lte=timezone.now())
+        visible_to_all_q = Release.visible_q()
         
         if user.is_authenticated:
             if user.is_staff:
@@ -139,17 +139,11 @@ class ReleaseViewSet(viewsets.ModelViewSet):
         ).first()
 
         if existing_ready_download:
+            existing_ready_download.release = release # Already loaded; the serializer reads its title
             status_serializer = GeneratedDownloadStatusSerializer(existing_ready_download, context={'request': request})
             return Response(status_serializer.data, status=status.HTTP_200_OK)
 
-        download_request = GeneratedDownload.objects.create(
-            release=release,
-            user=request.user,
-            requested_format=requested_format,
-            status=GeneratedDownload.StatusChoices.PENDING
-        )
-
-        generate_release_download_zip.delay(download_request.id)
+        download_request = request_release_download_zip(release, request.user, requested_format)
 
         status_serializer = GeneratedDownloadStatusSerializer(download_request, context={'request': request})
         return Response(status_serializer.data, status=status.HTTP_202_ACCEPTED)
@@ -159,7 +153,7 @@ class TrackViewSet(viewsets.ModelViewSet):
     serializer_class = TrackSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
     filterset_fields = ['release', 'genres', 'release__artist__name']
-    search_fields = ['title', 'release__title', 'release__artist__name', 'genres__name']
+    search_fields = ['title', 'release_title_cached', 'artist_name_cached', 'genres__name']
     ordering_fields = ['track_number', 'title', 'listen_count', 'release__release_date']
     ordering = ['release__release_date', 'track_number']
 
@@ -177,26 +171,27 @@ class TrackViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        qs = Track.objects.select_related(
-            'release__artist', 
-            'release__artist__user' 
-        ).prefetch_related('genres')
-
-        if self.action == 'list': 
-            if user.is_authenticated:
-                if user.is_staff:
-                    return qs 
-                try:
-                    user_artist = Artist.objects.get(user=user)
-                    return qs.filter(
-                        django_models.Q(release__is_published=True, release__release_date__lte=timezone.now()) |
-                        django_models.Q(release__artist=user_artist)
-                    ).distinct()
-                except Artist.DoesNotExist:
-                    return qs.filter(release__is_published=True, release__release_date__lte=timezone.now()).distinct()
-            else:
-                return qs.filter(release__is_published=True, release__release_date__lte=timezone.now()).distinct()
-        return qs 
+
+        if self.action != 'list':
+            return Track.objects.select_related(
+                'release__artist', 
+                'release__artist__user' 
+            ).prefetch_related('genres')
+
+        # Listed tracks carry their release title and artist name; only the release row (cover art) is joined.
+        qs = Track.objects.select_related('release').prefetch_related('genres')
+        if user.is_authenticated:
+            if user.is_staff:
+                return qs 
+            try:
+                user_artist = Artist.objects.get(user=user)
+                return qs.filter(
+                    Release.visible_q('release__') |
+                    django_models.Q(release__artist=user_artist)
+                ).distinct()
+            except Artist.DoesNotExist:
+                return qs.filter(Release.visible_q('release__')).distinct()
+        return qs.filter(Release.visible_q('release__')).distinct()
 
     @action(detail=True, methods=['post'], serializer_class=ListenSegmentLogSerializer)
     def log_listen_segment(self, request, pk=None):
@@ -299,9 +294,8 @@ class HighlightViewSet(viewsets.ModelViewSet):
 
 
 def stream_track_audio(request, track_id):
-    print(f"--- stream_track_audio for track_id: {track_id} ---") 
-    http_range = request.META.get('HTTP_RANGE')
-    print(f"DEBUG: HTTP_RANGE header received: {http_range}") 
+    # %-style arguments: nothing is formatted unless DEBUG logging is enabled.
+    logger.debug("stream_track_audio for track %s, HTTP_RANGE: %s", track_id, request.META.get('HTTP_RANGE'))
 
     track = get_object_or_404(Track, pk=track_id)
     
@@ -321,41 +315,35 @@ def stream_track_audio(request, track_id):
         can_stream = True
             
     if not can_stream:
-        print(f"DEBUG: Permission denied for track {track_id}. User: {request.user}") 
+        logger.debug("Permission denied for track %s. User: %s", track_id, request.user)
         raise Http404("Track not found or you do not have permission to stream it.")
 
     if not track.audio_file:
-        print(f"DEBUG: No audio_file attribute for track {track_id}.") 
+        logger.debug("No audio_file for track %s.", track_id)
         raise Http404("Audio file not found for this track.")
     if not track.audio_file.storage.exists(track.audio_file.name):
-        print(f"DEBUG: Audio file '{track.audio_file.name}' does not exist in storage.") 
+        logger.warning("Audio file '%s' of track %s does not exist in storage.", track.audio_file.name, track_id)
         raise Http404("Audio file path does not exist in storage.")
 
     try:
         file_to_serve = track.audio_file.open('rb')
-        print(f"DEBUG: Opened file '{track.audio_file.name}' for streaming.") 
-        
+
         content_type, encoding = mimetypes.guess_type(track.audio_file.name)
         if content_type is None:
             content_type = 'application/octet-stream'
         
         if track.audio_file.name.lower().endswith('.wav') and content_type == 'audio/x-wav':
             content_type = 'audio/wav'
-        print(f"DEBUG: Serving with Content-Type: {content_type}") 
+        logger.debug("Streaming '%s' as %s.", track.audio_file.name, content_type)
 
         response = FileResponse(file_to_serve, content_type=content_type, as_attachment=False)
         response['Accept-Ranges'] = 'bytes'
-        
-        print(f"DEBUG: FileResponse created. Accept-Ranges: {response.get('Accept-Ranges')}") 
-        
         return response
     except FileNotFoundError:
-        print(f"DEBUG: FileNotFoundError for track {track_id} (should have been caught by storage.exists).") 
+        logger.warning("FileNotFoundError for track %s (should have been caught by storage.exists).", track_id)
         raise Http404("Audio file not found on the server's filesystem.")
-    except Exception as e:
-        print(f"ERROR serving audio file for track {track_id}: {e}") 
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error serving audio file for track %s", track_id)
         raise Http404("An error occurred while trying to serve the audio file.")
 
 class GeneratedDownloadStatusViewSet(viewsets.ReadOnlyModelViewSet):
@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django.urls import reverse # For constructing links if needed
 from interactions.models import Follow
@@ -28,6 +28,13 @@ def create_follow_notification(sender, instance: Follow, created: bool, **kwargs
             logger.info(f"Created NEW_FOLLOWER notification for {artist_owner.username} from {instance.user.username} for artist {instance.artist.name}")
 
 
+@receiver(pre_save, sender=Release)
+def remember_release_visibility(sender, instance: Release, **kwargs):
+    # Visibility as stored before this save, read once with an EXISTS: by post_save the row
+    # already holds the new values, so it can't be re-read there.
+    instance._was_visible = instance.pk is not None and \
+        Release.objects.filter(Release.visible_q(), pk=instance.pk).exists()
+
 @receiver(post_save, sender=Release)
 def create_new_release_notifications(sender, instance: Release, created: bool, **kwargs):
     # Notify followers only if the release is newly published or an existing draft is published
@@ -39,13 +46,8 @@ def create_new_release_notifications(sender, instance: Release, created: bool, *
     is_newly_effectively_published = False
     if created and instance.is_visible():
         is_newly_effectively_published = True
-    elif not created: # It's an update
-        try:
-            old_instance = Release.objects.get(pk=instance.pk)
-            if not old_instance.is_visible() and instance.is_visible():
-                is_newly_effectively_published = True
-        except Release.DoesNotExist:
-            pass # Should not happen in post_save for existing
+    elif not getattr(instance, '_was_visible', True) and instance.is_visible(): # An update that made it visible
+        is_newly_effectively_published = True
 
     if is_newly_effectively_published:
         followers = Follow.objects.filter(artist=instance.artist).select_related('user')
@@ -119,10 +121,9 @@ def create_chat_message_notification(sender, instance: ChatMessage, created: boo
 
                 # Case 1: Conversation was initiated by someone else TO this participant's artist profile
                 if conversation.related_artist_recipient and \
-                   hasattr(participant_user, 'artist_profile') and \
-                   participant_user.artist_profile == conversation.related_artist_recipient:
+                   conversation.related_artist_recipient.user_id == participant_user.id:
                     is_for_artist_channel = True
-                    recipient_as_artist = participant_user.artist_profile
+                    recipient_as_artist = conversation.related_artist_recipient
                 
                 # Case 2: Conversation was initiated by this participant AS an artist profile
                 # (and the message is from the other party)
@@ -20,9 +20,9 @@ class PlaylistViewSet(viewsets.ModelViewSet):
         if user.is_authenticated:
             return queryset.filter(
                 Q(owner=user) | Q(is_public=True)
-            ).select_related('owner').prefetch_related('tracks__release__artist', 'tracks__genres').distinct()
+            ).select_related('owner').prefetch_related('tracks__release', 'tracks__genres').distinct()
         else:
-            return queryset.filter(is_public=True).select_related('owner').prefetch_related('tracks__release__artist', 'tracks__genres')
+            return queryset.filter(is_public=True).select_related('owner').prefetch_related('tracks__release', 'tracks__genres')
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -15,7 +15,7 @@ from .models import Product, Order, OrderItem
 from .serializers import OrderSerializer, OrderCreateSerializer
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from library.models import UserLibraryItem
+from library.models import UserLibraryItem, ACQUISITION_FREE, ACQUISITION_PURCHASED, ACQUISITION_NYP
 from music.models import Release
 
 import logging # For logging webhook events
@@ -66,11 +66,11 @@ class OrderViewSet(viewsets.ModelViewSet):
         if user.is_authenticated:
             for item in order.items.all():
                 if item.product.release:
-                    acquisition_type = UserLibraryItem.ACQUISITION_CHOICES[1][0] # PURCHASED
+                    acquisition_type = ACQUISITION_PURCHASED
                     if item.product.release.pricing_model == Release.PricingModel.NAME_YOUR_PRICE:
-                         acquisition_type = UserLibraryItem.ACQUISITION_CHOICES[2][0] # NYP
+                         acquisition_type = ACQUISITION_NYP
                     elif item.product.release.pricing_model == Release.PricingModel.FREE:
-                         acquisition_type = UserLibraryItem.ACQUISITION_CHOICES[0][0] # FREE
+                         acquisition_type = ACQUISITION_FREE
 
                     library_item, created = UserLibraryItem.objects.get_or_create(
                         user=user,
@@ -78,8 +78,8 @@ class OrderViewSet(viewsets.ModelViewSet):
                         defaults={'acquisition_type': acquisition_type}
                     )
                     if not created and library_item.acquisition_type != acquisition_type:
-                         if library_item.acquisition_type == UserLibraryItem.ACQUISITION_CHOICES[0][0] and \
-                            acquisition_type != UserLibraryItem.ACQUISITION_CHOICES[0][0]:
+                         if library_item.acquisition_type == ACQUISITION_FREE and \
+                            acquisition_type != ACQUISITION_FREE:
                             library_item.acquisition_type = acquisition_type
                             library_item.save(update_fields=['acquisition_type'])
                     logger.info(f"Order Completion (Simulated): Added/Updated {item.product.release.title} to {user.username}'s library (Type: {acquisition_type}).")
@@ -299,12 +299,12 @@ def paypal_webhook(request):
                     if user and user.is_authenticated: # User should exist for an order
                         for item in order.items.all():
                             if item.product.release:
-                                acquisition_type = UserLibraryItem.ACQUISITION_CHOICES[1][0] # PURCHASED
+                                acquisition_type = ACQUISITION_PURCHASED
                                 if item.product.release.pricing_model == Release.PricingModel.NAME_YOUR_PRICE:
-                                    acquisition_type = UserLibraryItem.ACQUISITION_CHOICES[2][0] # NYP
+                                    acquisition_type = ACQUISITION_NYP
                                 elif item.product.release.pricing_model == Release.PricingModel.FREE:
                                     # This case shouldn't happen for a paid order, but handle defensively
-                                    acquisition_type = UserLibraryItem.ACQUISITION_CHOICES[0][0] # FREE
+                                    acquisition_type = ACQUISITION_FREE
 
                                 library_item, created = UserLibraryItem.objects.get_or_create(
                                     user=user,
@@ -312,8 +312,8 @@ def paypal_webhook(request):
                                     defaults={'acquisition_type': acquisition_type}
                                 )
                                 if not created and library_item.acquisition_type != acquisition_type:
-                                    if library_item.acquisition_type == UserLibraryItem.ACQUISITION_CHOICES[0][0] and \
-                                    acquisition_type != UserLibraryItem.ACQUISITION_CHOICES[0][0]:
+                                    if library_item.acquisition_type == ACQUISITION_FREE and \
+                                    acquisition_type != ACQUISITION_FREE:
                                         library_item.acquisition_type = acquisition_type
                                         library_item.save(update_fields=['acquisition_type'])
                                 logger.info(f"Webhook: Added/Updated {item.product.release.title} to {user.username}'s library (Type: {acquisition_type}).")
@@ -8,7 +8,6 @@ from decimal import Decimal
 from django.contrib.auth import get_user_model
 
 from music.models import Artist, Release, Track, ListenEvent, Genre 
-from interactions.models import Follow
 from shop.models import OrderItem, Order, Product
 from .serializers import (
     ArtistDashboardStatsSerializer, 
@@ -66,7 +65,7 @@ class ArtistStatsViewSet(viewsets.ViewSet):
         )
         total_sales_value_usd = total_sales_value_usd_agg['total_revenue'] or Decimal('0.00')
 
-        current_follower_count = Follow.objects.filter(artist=artist_profile).count()
+        current_follower_count = artist_profile.followers_count
 
         summary_data = {
             'total_release_listens': total_release_listens,
@@ -155,6 +155,28 @@ WSGI_APPLICATION = 'vaultwave.wsgi.application'
 DATABASES = {
     'default': env.db(),
 }
+# Reuse connections across requests instead of reconnecting to Postgres for each one.
+DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Shared cache for hot lookups such as follow state; falls back to a per-process cache when no Redis URL is set.
+CACHE_REDIS_URL = env('CACHE_REDIS_URL', default='')
+# Entries that signals keep in step with the database (follow state, library lists) are only cached when every
+# process shares the cache: a per-process copy cannot be invalidated by a write handled in another process.
+CACHE_IS_SHARED = bool(CACHE_REDIS_URL)
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -195,6 +217,10 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'vaultwave.renderers.ORJSONRenderer', # Same JSON as DRF's JSONRenderer, encoded with orjson
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'PAGE_SIZE': 10 # Example page size
 }
 
@@ -268,6 +294,13 @@ CELERY_TIMEZONE = 'UTC' # Recommended to use UTC
 
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
+# Release ZIP builds and bulk download-file cleanup are long and I/O heavy; they get their own queue
+# (and worker, see docker-compose.yml) so they can't hold up short tasks such as listen processing.
+CELERY_TASK_ROUTES = {
+    'music.tasks.generate_release_download_zip': {'queue': 'downloads'},
+    'music.cleanup_generated_download_files': {'queue': 'downloads'},
+}
+
 # Celery Beat Schedule
 CELERY_BEAT_SCHEDULE = {
     'cleanup-generated-downloads-daily': {
@@ -1,4 +1,5 @@
 import os
+import copy
 import logging
 from django.core.exceptions import ValidationError
 from PIL import Image, UnidentifiedImageError
@@ -15,7 +16,7 @@ def delete_file_if_changed(sender, instance, field_name):
     if not instance.pk:
         return
     try:
-        old_instance = sender.objects.get(pk=instance.pk)
+        old_instance = sender.objects.only(field_name).get(pk=instance.pk) # Only the file column is compared
     except sender.DoesNotExist:
         return
 
@@ -62,6 +63,28 @@ def delete_file_on_instance_delete(instance_file_field):
                 logger.error(f"Util Signal: Error deleting file {instance_file_field.path} on instance delete (local): {e}")
 
 
+# --- Serializer Utilities ---
+
+class CachedFieldsSerializerMixin:
+    """
+    Memoizes ModelSerializer.get_fields() per serializer class.
+    get_fields() introspects the model on every serializer instantiation; with this mixin
+    each instance instead receives copies of a prototype field map built once.
+    Only use it on serializers whose fields do not depend on context or the instance.
+    """
+    _fields_prototype_cache = {}
+
+    def get_fields(self):
+        serializer_class = type(self)
+        prototype = CachedFieldsSerializerMixin._fields_prototype_cache.get(serializer_class)
+        if prototype is None:
+            prototype = super().get_fields()
+            CachedFieldsSerializerMixin._fields_prototype_cache[serializer_class] = prototype
+        # Fields are bound to their parent serializer, so every instance needs its own copies.
+        # Deep copies, as DRF makes of declared fields: a many=True field's child must be rebound too.
+        return copy.deepcopy(prototype)
+
+
 # --- Image Validation ---
 def validate_image_not_gif_utility(value):
     """